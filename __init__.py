@@ -1,84 +1,450 @@
-import json
+import sys
 import tarfile
-from typing import Iterator
+import tracemalloc
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import cached_property
+from typing import IO, Iterable, Iterator
 
+from .access_graph import AccessPolicyGraph
 from .archive_classes import ACIUntarBase, ACIUntarJSON, ACIUntarXML
+from .base import RawConfigs
+from .cache import ParseCache
+from .diff import diff, diff_summary
+from .encap_index import EncapIndex
+from .export import (
+    iter_managed_objects,
+    iter_section_objects,
+    to_sqlite,
+    write_json,
+    write_ndjson,
+)
+from .managed_object import ManagedObject, compact_raw_configs, json_default
+from .tenant_collection import TenantCollection
 from .extractor_classes import (
     ExtractInterestingKeys,
     ExtractFabricDetails,
     ExtractSystemSettings,
     ExtractFabricPolicies,
     ExtractAccessPolicies,
+    ExtractTenantPolicies,
 )
+from .version import __version__
 
 
 class ACIConfig:
-    def __init__(self, backup_file: str) -> None:
+    # The configuration sections, extracted the first time they are accessed
+    section_attributes: tuple[str, ...] = (
+        "fabric_details",
+        "system_settings",
+        "fabric_policies",
+        "access_policies",
+        "tenant_policies",
+    )
+    # The attributes that make up the extracted configuration, in output order (see to_dict)
+    config_attributes: tuple[str, ...] = (
+        "backup_file",
+        *section_attributes,
+        "tenants",
+        "virtual_networking",
+    )
+
+    def __init__(
+        self,
+        backup_file: str,
+        cache: ParseCache | str | None = None,
+        jobs: int | None = None,
+        decoder: str | None = None,
+        compact: bool = False,
+        intern_strings: bool = False,
+        lean: bool = False,
+        lazy_tenants: bool = False,
+        hash_subtrees: bool = False,
+        previous: "ACIConfig | None" = None,
+    ) -> None:
+        """
+        :param backup_file: Path to the ACI backup archive
+        :param cache: Optional ParseCache (or a cache directory) to load the parsed backup from,
+            or store it to on a cache miss. A cache hit skips decompressing and decoding the archive
+            (interesting_files will be empty).
+        :param jobs: Decode the archive's files in this many worker processes. Only the harvested
+            root keys come back from the workers (interesting_files will be empty).
+        :param decoder: JSON decoder backend ("orjson", "ujson" or "json"), defaults to the fastest installed
+        :param compact: Hold the managed objects as compact ManagedObjects instead of nested
+            dictionaries (interesting_files will be empty, as it would hold a full dictionary copy)
+        :param intern_strings: Share one object between all equal attribute names and short values.
+            The memory saved is reported in intern_stats
+        :param lean: Extract every section up front, then release the decoded files and the root
+            keys that only the sections referenced. Only the parts of the backup the sections,
+            tenants and virtual_networking hold on to are kept (by_dn() and raw_configs are limited
+            to fvTenant and vmmProvP). tenants and virtual_networking are part of the output and
+            are kept whole, so little is released when the tenants make up most of the backup
+            (combine with lazy_tenants to keep them serialized). When tracemalloc is tracing, the
+            peak and retained memory of the load are reported in memory_report (the peak is reset)
+        :param lazy_tenants: Keep each tenant serialized and only build it when it is accessed
+            (tenants is a TenantCollection, see tenants.names() and tenants.counts()). The tenants
+            are left out of by_dn() and raw_configs' indexes (interesting_files will be empty)
+        :param hash_subtrees: Compute the content hash of every managed object's subtree while
+            loading (see RawConfigs.hash_subtrees), so diff() can skip the unchanged parts of the
+            backups. The hashes are stored in the cache along with the raw configs
+        :param previous: An ACIConfig of an earlier backup of the same fabric (e.g. loaded from
+            the cache). The root keys that changed since then are worked out (see changed_keys,
+            faster when both were loaded with hash_subtrees=True) and the sections only rerun the
+            child extractors that depend on them, reusing the previous output of the others.
+            Only the sections the previous ACIConfig had already extracted are reused
+        """
+        # lean=True reports the memory traced from here, when tracemalloc is tracing
+        traced_bytes: int | None = None
+        if lean and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced_bytes = tracemalloc.get_traced_memory()[0]
+
         self.backup_file: str = backup_file
-        self.interesting_files: list = list(self._get_extractor_())
-        self.raw_configs: dict = ExtractInterestingKeys(
-            self.interesting_files
-        ).to_dict()
-        self.fabric_details: dict = ExtractFabricDetails(self.raw_configs).to_dict()
-        self.system_settings: dict = ExtractSystemSettings(self.raw_configs).to_dict()
-        self.fabric_policies: dict = ExtractFabricPolicies(self.raw_configs).to_dict()
-        self.access_policies: dict = ExtractAccessPolicies(self.raw_configs).to_dict()
-        self.tenants: list = self.raw_configs["fvTenant"]
+        self.interesting_files: list = []
+        self.intern_stats: dict[str, int] = {}
+        self.memory_report: dict[str, int] = {}
+        # The root keys that changed since the previous backup (None without a previous backup)
+        self.changed_keys: set[str] | None = None
+        self._previous_sections_: dict[str, dict] = {}
+
+        if isinstance(cache, str):
+            cache = ParseCache(cache)
+        cache_key: str = ""
+        cached: dict | None = None
+        if cache:
+            cache_key = (
+                cache.key(self.backup_file)
+                + ("-compact" if compact else "")
+                + ("-lazy" if lazy_tenants else "")
+            )
+            cached = cache.load(cache_key)
+
+        if cached:
+            self.raw_configs: RawConfigs = RawConfigs(cached["raw_configs"])
+            # Seed the lazily extracted sections that were cached along with the raw configs
+            self.__dict__.update(cached["sections"])
+            self.raw_configs.subtree_hashes = cached.get("subtree_hashes")
+            if hash_subtrees:
+                self.raw_configs.hash_subtrees()
+        else:
+            self.raw_configs = RawConfigs(
+                self._extract_raw_configs_(
+                    jobs, decoder, compact, intern_strings, lazy_tenants
+                )
+            )
+            if hash_subtrees:
+                self.raw_configs.hash_subtrees()
+
+        if previous is not None:
+            self.changed_keys = self.raw_configs.changed_keys(previous.raw_configs)
+            self._previous_sections_ = {
+                key: previous.__dict__[key]
+                for key in self.section_attributes
+                if key in previous.__dict__
+            }
+
+        # Stored after previous is applied, so the cached sections are extracted incrementally
+        if cache and not cached:
+            sections: dict = {}
+            if cache.store_sections:
+                sections = {key: getattr(self, key) for key in self.section_attributes}
+            cache.store(
+                cache_key,
+                {
+                    "raw_configs": dict(self.raw_configs),
+                    "sections": sections,
+                    "subtree_hashes": self.raw_configs.subtree_hashes,
+                },
+            )
+
+        if lean:
+            self._release_unreferenced_(traced_bytes)
+
+        self.tenants: list | TenantCollection = self.raw_configs["fvTenant"]
         self.virtual_networking: list = self.raw_configs["vmmProvP"]
 
+    def _release_unreferenced_(self, traced_bytes: int | None) -> None:
+        """
+        Extract every section while the raw configs are available, then drop the decoded
+        files and every root key except the ones tenants and virtual_networking point to.
+        The sections keep references to the (small) parts of the backup they use.
+        The memory is read from tracemalloc (relative to traced_bytes) instead of walking the
+        objects, which would cost as much as the load itself.
+        """
+        key: str
+        for key in self.section_attributes:
+            getattr(self, key)
+
+        self.interesting_files = []
+        if isinstance(self.raw_configs["fvTenant"], TenantCollection):
+            # The sections hold on to what they need from the tenants
+            self.raw_configs["fvTenant"].release()
+        # The indexes are built on first use, so this doesn't walk the kept keys
+        subtree_hashes: dict[str, bytes] | None = self.raw_configs.subtree_hashes
+        self.raw_configs = RawConfigs(
+            {key: self.raw_configs[key] for key in ("fvTenant", "vmmProvP")}
+        )
+        self.raw_configs.subtree_hashes = subtree_hashes
+
+        if traced_bytes is not None:
+            current_bytes: int
+            peak_bytes: int
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            self.memory_report = {
+                "peak_bytes": peak_bytes - traced_bytes,
+                "retained_bytes": current_bytes - traced_bytes,
+            }
+
+    def _extract_raw_configs_(
+        self,
+        jobs: int | None,
+        decoder: str | None,
+        compact: bool,
+        intern_strings: bool,
+        lazy_tenants: bool,
+    ) -> dict:
+        """Read the backup archive and harvest the interesting root keys from its files"""
+        extractor: ACIUntarBase = self._get_extractor_(
+            jobs=jobs, decoder=decoder, intern_strings=intern_strings
+        )
+        self.interesting_files = list(extractor)
+        if extractor.interner:
+            self.intern_stats = extractor.interner.stats
+
+        interesting_keys: ExtractInterestingKeys
+        if extractor.harvested is not None:
+            interesting_keys = ExtractInterestingKeys.from_harvested(
+                extractor.harvested
+            )
+        else:
+            interesting_keys = ExtractInterestingKeys(self.interesting_files)
+
+        raw_configs: dict = interesting_keys.to_dict()
+        if lazy_tenants:
+            # Serialize the tenants before anything else walks them (indexes, compact)
+            raw_configs["fvTenant"] = TenantCollection(
+                raw_configs["fvTenant"], compact=compact
+            )
+
+        if compact or lazy_tenants:
+            # The decoded files would keep a full dictionary copy of every MO alive
+            self.interesting_files = []
+        if compact:
+            return compact_raw_configs(raw_configs)
+
+        return raw_configs
+
     def __str__(self) -> str:
         return self.backup_file
 
     def __iter__(self) -> Iterator:
-        exclude_attributes: list = ["interesting_files", "raw_configs"]
-        keys_to_iterate: list = [
-            key for key in self.__dict__.keys() if not key in exclude_attributes
-        ]
-
         key: str
-        for key in keys_to_iterate:
+        for key in self.config_attributes:
             yield (key, getattr(self, key))
 
-    def _get_extractor_(self) -> ACIUntarBase:
-        """Validate backup archive and determine which Untar subclass to use"""
-
-        tarball: tarfile.TarFile
-        with tarfile.open(self.backup_file, "r") as tarball:
-            # Create a list of JSON & XML files in the backup tarball
-            json_files: list = [
-                file for file in tarball.getnames() if file.endswith(".json")
-            ]
-            xml_files: list = [
-                file for file in tarball.getnames() if file.endswith(".xml")
-            ]
-
-        if json_files:
-            return ACIUntarJSON(self.backup_file)
-        elif xml_files:
-            raise Exception("XML backup parsing not yet implemented")
-            # return ACIUntarXML(self.backup_file)
-        else:
-            raise ValueError(
-                f"Unable to locate JSON or XML files in the archive. {self.backup_file} doesn't appear to be a valid ACI Config Backup."
-            )
+    def _incremental_(self, section: str) -> dict:
+        """The previous output of a section and the changed root keys, for incremental extraction"""
+        return {
+            "previous": self._previous_sections_.pop(section, None),
+            "changed_keys": self.changed_keys,
+        }
+
+    # The configuration sections are only extracted the first time they are accessed
+    @cached_property
+    def fabric_details(self) -> dict:
+        return ExtractFabricDetails(
+            self.raw_configs, **self._incremental_("fabric_details")
+        ).to_dict()
+
+    @cached_property
+    def system_settings(self) -> dict:
+        return ExtractSystemSettings(
+            self.raw_configs, **self._incremental_("system_settings")
+        ).to_dict()
+
+    @cached_property
+    def fabric_policies(self) -> dict:
+        return ExtractFabricPolicies(
+            self.raw_configs, **self._incremental_("fabric_policies")
+        ).to_dict()
+
+    @cached_property
+    def access_policies(self) -> dict:
+        return ExtractAccessPolicies(
+            self.raw_configs, **self._incremental_("access_policies")
+        ).to_dict()
+
+    @cached_property
+    def tenant_policies(self) -> dict:
+        return ExtractTenantPolicies(
+            self.raw_configs, **self._incremental_("tenant_policies")
+        ).to_dict()
+
+    @cached_property
+    def access_graph(self) -> AccessPolicyGraph:
+        """
+        The access policy resolution chain from switch ports to VLAN pools (see AccessPolicyGraph).
+        Not available after lean=True released the access policy root keys.
+        """
+        return AccessPolicyGraph(self.raw_configs)
+
+    @cached_property
+    def encap_index(self) -> EncapIndex:
+        """
+        Interval index over the encap blocks of the VLAN, VXLAN and VSAN pools (see EncapIndex).
+        Not available after lean=True released the access policy root keys.
+        """
+        return EncapIndex(self.raw_configs)
+
+    def _get_extractor_(self, **kwargs) -> ACIUntarBase:
+        """
+        Validate backup archive and determine which Untar subclass to use.
+        Keyword arguments are passed on to the Untar class.
+        """
+
+        # Stream the archive and let the first JSON or XML member decide the backup type.
+        # The open stream is handed to the Untar class so the archive is only read once.
+        tarball: tarfile.TarFile = tarfile.open(self.backup_file, "r|*")
+        member: tarfile.TarInfo | None = tarball.next()
+        while member is not None:
+            if member.isfile() and member.name.endswith(".json"):
+                return ACIUntarJSON(self.backup_file, tarball, member, **kwargs)
+            elif member.isfile() and member.name.endswith(".xml"):
+                return ACIUntarXML(self.backup_file, tarball, member, **kwargs)
+            member = tarball.next()
+        tarball.close()
+
+        raise ValueError(
+            f"Unable to locate JSON or XML files in the archive. {self.backup_file} doesn't appear to be a valid ACI Config Backup."
+        )
+
+    def by_dn(self, dn: str) -> dict | None:
+        """
+        Returns the managed object with the given distinguished name, or None.
+        Example: config.by_dn("uni/infra/vlanns-[pool]-static")
+        """
+        return self.raw_configs.dn_index.get(dn)
 
     def to_dict(self) -> dict:
         return dict(iter(self))
 
-    def pretty_print(self, obj=None) -> None:
+    def iter_objects(self, sections: bool = False) -> Iterator[dict]:
+        """
+        Yields a {"section", "class", "dn", "parent_dn", "attributes"} record per managed object,
+        walking the raw configs (section is the root key) or, with sections=True, the extracted
+        sections (section is the path in the section's output). See export.iter_managed_objects
+        and export.iter_section_objects.
+        """
+        if sections:
+            return iter_section_objects(self)
+
+        return iter_managed_objects(self.raw_configs)
+
+    def write_ndjson(
+        self, path: str | IO, sections: bool = False, compress: bool = False
+    ) -> int:
+        """
+        Writes one JSON line per managed object (see iter_objects) and returns the number of lines.
+        :param path: Path of the file to write (gzipped when it ends in .gz), or an open file object
+        :param compress: Gzip the output
+        """
+        return write_ndjson(self.iter_objects(sections), path, compress)
+
+    def to_sqlite(self, path: str, batch_size: int = 10000) -> int:
+        """
+        Writes every managed object of the backup to a SQLite database at path, with a table
+        of managed objects and a table of their attributes (see export.to_sqlite).
+        Returns the number of managed objects written.
+        """
+        return to_sqlite(self.raw_configs, path, batch_size)
+
+    def pretty_print(self, obj=None, indent: int | None = 4) -> None:
+        """Prints the whole config (or obj) as JSON, encoded straight to stdout"""
         if not obj:
-            return print(json.dumps(dict(self), indent=4))
-        elif isinstance(obj, (dict, list)):
-            return print(json.dumps(obj, indent=4))
+            write_json(dict(self), sys.stdout, indent)
+            print()
+        elif isinstance(obj, (dict, list, TenantCollection)):
+            write_json(obj, sys.stdout, indent)
+            print()
         else:
             print(str(obj))
 
-    def write(self, obj: dict | None = None) -> None:
-        def writer(obj) -> None:
-            with open("config.json", "w") as f:
-                f.write(json.dumps(obj, indent=4))
-
+    def write(
+        self,
+        obj: dict | list | TenantCollection | None = None,
+        path: str | IO = "config.json",
+        indent: int | None = 4,
+        compress: bool = False,
+    ) -> None:
+        """
+        Writes the whole config (or obj) as JSON, encoded chunk by chunk straight to the file
+        :param path: Path of the file to write (gzipped when it ends in .gz), or an open file object
+        :param indent: Indentation of the output, None for compact output
+        :param compress: Gzip the output
+        """
         if not obj:
-            writer(dict(self))
-        elif isinstance(obj, (list, dict)):
-            writer(obj)
+            write_json(dict(self), path, indent, compress)
+        elif isinstance(obj, (list, dict, TenantCollection)):
+            write_json(obj, path, indent, compress)
+
+
+def _load_backup_(backup_file: str, as_dict: bool, kwargs: dict) -> ACIConfig | dict:
+    """Worker for load_many(): parse one backup and extract every section"""
+    config: ACIConfig = ACIConfig(backup_file, **kwargs)
+    config_dict: dict = config.to_dict()
+    if as_dict:
+        return config_dict
+
+    # The decoded files are only needed to harvest the raw configs, don't ship them back
+    config.interesting_files = []
+    return config
+
+
+def load_many(
+    backup_files: Iterable[str],
+    jobs: int | None = None,
+    as_dict: bool = False,
+    **kwargs,
+) -> Iterator[tuple[str, ACIConfig | dict | Exception]]:
+    """
+    Parses many backups in a pool of worker processes and yields (backup file, result)
+    tuples as each one completes (not in input order).
+    The result is the ACIConfig (with every section already extracted and
+    interesting_files emptied), its to_dict() output when as_dict is True, or the
+    exception raised while parsing that backup. One bad backup doesn't stop the others.
+    Closing the generator early (e.g. breaking out of the loop) cancels the backups not started yet.
+
+    :param backup_files: Paths to the ACI backup archives
+    :param jobs: Number of worker processes (defaults to the number of CPUs). 1 parses serially in this process
+    :param as_dict: Return the to_dict() output instead of ACIConfig objects (cheaper to send between processes)
+    :param kwargs: Passed through to ACIConfig (e.g. cache=...)
+
+    Example usage:
+    for backup_file, config in load_many(paths, jobs=8):
+        if isinstance(config, Exception):
+            ...
+    """
+    backup_file: str
+    if jobs == 1:
+        for backup_file in backup_files:
+            try:
+                yield backup_file, _load_backup_(backup_file, as_dict, kwargs)
+            except Exception as e:
+                yield backup_file, e
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: dict[Future, str] = {
+            executor.submit(_load_backup_, backup_file, as_dict, kwargs): backup_file
+            for backup_file in backup_files
+        }
+
+        future: Future
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+        finally:
+            # When the generator is closed early, don't parse the backups still queued
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,254 @@
+from typing import Iterator
+
+from .base import RawConfigs, dict_extractor
+from .encap_index import encap_number
+
+# The classes that make up the switch profile -> interface profile -> selector -> policy group
+# chain, for leaf and spine profiles:
+# (switch profile, switch selector, relation to interface profile, port selector, relation to policy group)
+PROFILE_CHAINS: tuple[tuple[str, str, str, str, str], ...] = (
+    ("infraNodeP", "infraLeafS", "infraRsAccPortP", "infraHPortS", "infraRsAccBaseGrp"),
+    (
+        "infraSpineP",
+        "infraSpineS",
+        "infraRsSpAccPortP",
+        "infraSHPortS",
+        "infraRsSpAccGrp",
+    ),
+)
+
+
+def _int_range_(first: str, last: str) -> range:
+    """Returns the inclusive range between two numeric attributes (an empty 'last' means just 'first')"""
+    return range(int(first), int(last or first) + 1)
+
+
+class AccessPolicyGraph:
+    """
+    The access policy resolution chain from a switch port to the VLANs it can carry:
+    switch profile (infraNodeP) -> interface profile (infraAccPortP) -> port selector (infraHPortS)
+    -> policy group (infraAccPortGrp/infraAccBndlGrp) -> AAEP (infraAttEntityP)
+    -> domains (physDomP, l3extDomP...) -> VLAN pool (fvnsVlanInstP) -> encap blocks.
+    Spine profiles (infraSpineP...) are followed the same way.
+
+    The switch ports covered by every port selector are indexed up front, and each hop is a
+    lookup in the raw configs' DN index that is only resolved once, so resolving a port is
+    a few dictionary lookups no matter how many profiles the fabric has.
+
+    Example usage:
+    graph = config.access_graph
+    graph.resolve("101", "1/1")  # One entry per port selector the port belongs to
+    graph.vlans("101", "1/1")  # [(100, 199), ...]
+    for resolution in graph.resolve_all(): ...
+    """
+
+    def __init__(self, raw_configs: RawConfigs) -> None:
+        self.raw_configs: RawConfigs = raw_configs
+        # (node id, "card/port") ->
+        # [(switch profile dn, interface profile dn, selector dn, relation class to the policy group)]
+        self._ports_: dict[tuple[str, str], list[tuple[str, str, str, str]]] = {}
+        # selector dn -> resolved chain from the policy group down (see _selector_chain_)
+        self._chains_: dict[str, dict] = {}
+        # (dn, relation class) -> target DNs of the object's relations of that class
+        self._relations_: dict[tuple[str, str], list[str]] = {}
+
+        self._index_ports_()
+
+    def __str__(self) -> str:
+        return "AccessPolicyGraph"
+
+    def __len__(self) -> int:
+        return len(self._ports_)
+
+    def _children_of_(self, mo: dict, cls: str) -> list:
+        if "children" not in mo:
+            return []
+
+        return self.raw_configs.children_index.children(mo, cls)
+
+    def _dn_of_(self, mo: dict) -> str:
+        return self.raw_configs.dn_index.dn_of(mo) or ""
+
+    def _index_ports_(self) -> None:
+        """Index the switch ports covered by every port selector of every switch profile"""
+        profile_cls: str
+        switch_cls: str
+        rs_ports_cls: str
+        selector_cls: str
+        rs_group_cls: str
+        for (
+            profile_cls,
+            switch_cls,
+            rs_ports_cls,
+            selector_cls,
+            rs_group_cls,
+        ) in PROFILE_CHAINS:
+            profile: dict
+            for profile in dict_extractor(self.raw_configs, "infraInfra", profile_cls):
+                profile_dn: str = self._dn_of_(profile)
+                nodes: list[str] = [
+                    str(node)
+                    for switch in self._children_of_(profile, switch_cls)
+                    for block in self._children_of_(switch, "infraNodeBlk")
+                    for node in _int_range_(
+                        block["attributes"].get("from_", "0"),
+                        block["attributes"].get("to_", ""),
+                    )
+                ]
+
+                interface_profile_dn: str
+                for interface_profile_dn in self.relations(profile_dn, rs_ports_cls):
+                    interface_profile: dict | None = self.raw_configs.dn_index.get(
+                        interface_profile_dn
+                    )
+                    if interface_profile is None:
+                        continue
+
+                    selector: dict
+                    for selector in self._children_of_(interface_profile, selector_cls):
+                        entry: tuple[str, str, str, str] = (
+                            profile_dn,
+                            interface_profile_dn,
+                            self._dn_of_(selector),
+                            rs_group_cls,
+                        )
+                        port: str
+                        for port in self._selector_ports_(selector):
+                            node: str
+                            for node in nodes:
+                                self._ports_.setdefault((node, port), []).append(entry)
+
+    def _selector_ports_(self, selector: dict) -> Iterator[str]:
+        """Yields the "card/port" of every port covered by the port blocks of a selector"""
+        block: dict
+        for block in self._children_of_(selector, "infraPortBlk"):
+            attributes: dict = block["attributes"]
+            card: int
+            for card in _int_range_(
+                attributes.get("fromCard", "1"), attributes.get("toCard", "")
+            ):
+                port: int
+                for port in _int_range_(
+                    attributes.get("fromPort", "0"), attributes.get("toPort", "")
+                ):
+                    yield f"{card}/{port}"
+
+    def relations(self, dn: str, cls: str) -> list[str]:
+        """Returns the target DNs (tDn) of the relations of the given class of the object with the given DN"""
+        key: tuple[str, str] = (dn, cls)
+        if key not in self._relations_:
+            mo: dict | None = self.raw_configs.dn_index.get(dn)
+            self._relations_[key] = (
+                [
+                    relation["attributes"].get("tDn", "")
+                    for relation in self._children_of_(mo, cls)
+                ]
+                if mo is not None
+                else []
+            )
+
+        return self._relations_[key]
+
+    def _relation_(self, dn: str | None, cls: str) -> str | None:
+        if dn is None:
+            return None
+
+        targets: list[str] = self.relations(dn, cls)
+        return targets[0] if targets else None
+
+    def vlan_blocks(self, pool_dn: str) -> list[tuple[int, int]]:
+        """Returns the (from, to) VLAN ranges of the encap blocks of a VLAN pool"""
+        pool: dict | None = self.raw_configs.dn_index.get(pool_dn)
+        if pool is None:
+            return []
+
+        return [
+            (
+                encap_number(block["attributes"]["from"]),
+                encap_number(block["attributes"]["to"]),
+            )
+            for block in self._children_of_(pool, "fvnsEncapBlk")
+        ]
+
+    def _selector_chain_(self, selector_dn: str, rs_group_cls: str) -> dict:
+        """Resolves (once) the chain from a port selector's policy group down to the VLAN blocks"""
+        if selector_dn not in self._chains_:
+            policy_group: str | None = self._relation_(selector_dn, rs_group_cls)
+            aaep: str | None = self._relation_(policy_group, "infraRsAttEntP")
+            domains: list[dict] = []
+
+            domain: str
+            for domain in self.relations(aaep, "infraRsDomP") if aaep else []:
+                vlan_pool: str | None = self._relation_(domain, "infraRsVlanNs")
+                domains.append(
+                    {
+                        "dn": domain,
+                        "vlan_pool": vlan_pool,
+                        "vlan_blocks": self.vlan_blocks(vlan_pool) if vlan_pool else [],
+                    }
+                )
+
+            self._chains_[selector_dn] = {
+                "policy_group": policy_group,
+                "aaep": aaep,
+                "domains": domains,
+            }
+
+        return self._chains_[selector_dn]
+
+    def resolve(self, node: str, port: str) -> list[dict]:
+        """
+        Returns the resolution chain of a switch port (e.g. "101", "1/1"), one entry for every
+        port selector the port belongs to (usually one), or an empty list.
+        """
+        resolutions: list[dict] = []
+
+        profile_dn: str
+        interface_profile_dn: str
+        selector_dn: str
+        rs_group_cls: str
+        for (
+            profile_dn,
+            interface_profile_dn,
+            selector_dn,
+            rs_group_cls,
+        ) in self._ports_.get((str(node), port), []):
+            resolutions.append(
+                {
+                    "node": str(node),
+                    "port": port,
+                    "switch_profile": profile_dn,
+                    "interface_profile": interface_profile_dn,
+                    "selector": selector_dn,
+                    **self._selector_chain_(selector_dn, rs_group_cls),
+                }
+            )
+
+        return resolutions
+
+    def resolve_all(self) -> Iterator[dict]:
+        """Yields the resolution chain of every indexed switch port (see resolve())"""
+        node: str
+        port: str
+        for node, port in self._ports_:
+            yield from self.resolve(node, port)
+
+    def vlans(self, node: str, port: str) -> list[tuple[int, int]]:
+        """Returns the (from, to) VLAN ranges a switch port can carry, sorted and merged"""
+        ranges: list[tuple[int, int]] = sorted(
+            block
+            for resolution in self.resolve(node, port)
+            for domain in resolution["domains"]
+            for block in domain["vlan_blocks"]
+        )
+
+        merged: list[tuple[int, int]] = []
+        first: int
+        last: int
+        for first, last in ranges:
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+
+        return merged
@@ -2,6 +2,8 @@ from .base import ChildExtractorBase, dict_extractor
 
 
 class AccessPoliciesSwitch(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra", "fabricInst")
+
     def _extract_config_(self) -> None:
         # 802.1X NODE AUTHENTICATION POLICIES
         self.config["dot1x_node_auth"] = dict_extractor(
@@ -115,6 +117,8 @@ class AccessPoliciesSwitch(ChildExtractorBase):
 
 
 class AccessPoliciesInterface(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # 802.1X PORT AUTH POLICIES
         self.config["dot1x_auth"] = dict_extractor(
@@ -273,6 +277,8 @@ class AccessPoliciesInterface(ChildExtractorBase):
 
 
 class AccessPoliciesGlobal(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # DHCP RELAY POLICIES
         self.config["dhcp"] = dict_extractor(
@@ -301,6 +307,8 @@ class AccessPoliciesGlobal(ChildExtractorBase):
 
 
 class AccessInterfaces(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # LEAF ACCESS PORT POLICY GROUPS
         self.config["leaf_access_polgrp"] = dict_extractor(
@@ -345,6 +353,8 @@ class AccessInterfaces(ChildExtractorBase):
 
 
 class AccessSwitches(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # LEAF SWITCH POLICY GROUPS
         self.config["leaf_polgrp"] = dict_extractor(
@@ -368,6 +378,8 @@ class AccessSwitches(ChildExtractorBase):
 
 
 class AccessPhyExtDomains(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("l2extDomP", "fcDomP", "l3extDomP", "physDomP")
+
     def _extract_config_(self) -> None:
         # EXTERNAL BRIDGED (L2) DOMAINS
         self.config["ext_l2"] = self.raw_configs["l2extDomP"]
@@ -383,6 +395,8 @@ class AccessPhyExtDomains(ChildExtractorBase):
 
 
 class AccessPools(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # VLAN POOLS
         self.config["vlan"] = dict_extractor(
@@ -1,15 +1,69 @@
-import json
 import xml.etree.ElementTree as ET
 import tarfile
-from typing import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import IO, Any, Iterable, Iterator
 from abc import ABC, abstractmethod
 
-import xmltodict  # type: ignore
+from .base import harvest_keys
+from .decoders import JSONDecoder, get_decoder
+from .extractor_classes import INTERESTING_KEYS
+from .interning import StringInterner
+
+
+def _decode_and_harvest_(
+    data: bytes, keys: tuple[str, ...], decoder_name: str, intern_strings: bool
+) -> tuple[dict[str, list], dict[str, int]]:
+    """
+    Worker for parallel decoding: decode one JSON file and return only the harvested root keys
+    (along with the interning stats). Strings shared within the result stay shared when it's
+    pickled back to the parent process.
+    """
+    found: dict[str, list] = harvest_keys(get_decoder(decoder_name).loads(data), keys)
+    if not intern_strings:
+        return found, {}
+
+    interner: StringInterner = StringInterner()
+    return interner.intern_tree(found), interner.stats  # type: ignore
 
 
 class ACIUntarBase(ABC):
-    def __init__(self, backup_file: str) -> None:
+    """
+    Reads the configuration files out of an ACI backup archive.
+    The archive is read as a stream so each member is decompressed exactly once.
+    If the caller has already started streaming the archive (see ACIConfig._get_extractor_)
+    the open tarball and the member it stopped on can be handed over to continue from there.
+
+    JSON is decoded with the decoder backend named by decoder (see decoders.py),
+    defaulting to the fastest one installed.
+    With intern_strings, the keys and short values of the decoded files are interned
+    (see interning.py) and the memory saved is reported in self.interner.stats.
+    With jobs > 1 (where supported) the files are decoded and their root keys harvested in
+    worker processes. Only the harvested root keys come back, one {key: [values]} dictionary
+    per file in archive order, in self.harvested (self.files is left empty).
+    """
+
+    extension: str = ""
+
+    def __init__(
+        self,
+        backup_file: str,
+        tarball: tarfile.TarFile | None = None,
+        first_member: tarfile.TarInfo | None = None,
+        jobs: int | None = None,
+        keys: Iterable[str] | None = None,
+        decoder: str | None = None,
+        intern_strings: bool = False,
+    ) -> None:
         self.file_name: str = backup_file
+        self._tarball_: tarfile.TarFile | None = tarball
+        self._first_member_: tarfile.TarInfo | None = first_member
+        self.jobs: int | None = jobs
+        self.keys: tuple[str, ...] = tuple(keys or INTERESTING_KEYS)
+        self.decoder: JSONDecoder = get_decoder(decoder)
+        self.harvested: list[dict[str, list]] | None = None
+        self.interner: StringInterner | None = (
+            StringInterner() if intern_strings else None
+        )
         self.files: list[dict] = self._get_files_from_archive_()
 
     def __str__(self) -> str:
@@ -18,6 +72,34 @@ class ACIUntarBase(ABC):
     def __iter__(self) -> Iterator:
         return iter(self.files)
 
+    def _iter_members_(self, as_file: bool = False) -> Iterator[tuple[str, Any]]:
+        """
+        Yields (member name, member bytes) for every file in the archive matching this
+        class's extension, in archive order, walking the archive a single time.
+        With as_file, a file object reading the member from the archive stream is yielded
+        instead of the bytes (it must be consumed before moving on to the next member).
+        """
+        tarball: tarfile.TarFile = self._tarball_ or tarfile.open(self.file_name, "r|*")
+        first_member: tarfile.TarInfo | None = self._first_member_
+        self._tarball_, self._first_member_ = None, None
+
+        with tarball:
+            # NOTE: Iterating a streamed TarFile restarts from its first member,
+            # so walk forward with next() to continue from where the caller stopped
+            member: tarfile.TarInfo | None = first_member or tarball.next()
+            while member is not None:
+                if member.isfile() and member.name.endswith(self.extension):
+                    member_file: IO[bytes] = tarball.extractfile(member)  # type: ignore
+                    yield member.name, member_file if as_file else member_file.read()
+                member = tarball.next()
+
+    def _intern_(self, file: dict) -> dict:
+        """Interns a decoded file when interning strings (see interning.py), right after it is decoded"""
+        if self.interner:
+            return self.interner.intern_tree(file)  # type: ignore
+
+        return file
+
     @abstractmethod
     def _get_files_from_archive_(self) -> list:
         """
@@ -31,76 +113,117 @@ class ACIUntarJSON(ACIUntarBase):
     Extracts .json files from an ACI JSON backup file and returns themn as a list of dictionaries.
     """
 
-    def _get_files_from_archive_(self) -> list:
-        files: list[dict] = []
+    extension: str = ".json"
 
-        tarball: tarfile.TarFile
-        with tarfile.open(self.file_name, "r") as tarball:
-            # Create a list of JSON files in the backup tarball
-            json_files: list = [
-                file for file in tarball.getnames() if file.endswith(".json")
+    def _get_files_from_archive_(self) -> list:
+        files: list[dict]
+        if self.jobs and self.jobs > 1:
+            self.harvested = self._harvest_in_parallel_()
+            files_found: bool = bool(self.harvested)
+            files = []
+        else:
+            # Decode (and intern) each JSON file, straight from the member bytes, as it streams
+            # out of the archive, so only one un-interned file is alive at a time
+            files = [
+                self._intern_(self.decoder.loads(data))
+                for _, data in self._iter_members_()
             ]
+            files_found = bool(files)
+
+        if not files_found:
+            raise ValueError(
+                "No JSON files detected in the backup archive. The backup file might be an XML backup."
+            )
 
-            if not json_files:
-                raise ValueError(
-                    "No JSON files detected in the backup archive. The backup file might be an XML backup."
+        return files
+
+    def _harvest_in_parallel_(self) -> list[dict[str, list]]:
+        """
+        Reads the files out of the archive sequentially and hands each one to a worker
+        process to decode and harvest. At most 2 files per worker are in flight at once,
+        so memory stays bounded when the workers fall behind the archive reader.
+        """
+        futures: list[Future] = []
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            in_flight: set[Future] = set()
+
+            data: bytes
+            for _, data in self._iter_members_():
+                if len(in_flight) >= 2 * self.jobs:  # type: ignore
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                future: Future = executor.submit(
+                    _decode_and_harvest_,
+                    data,
+                    self.keys,
+                    self.decoder.name,
+                    self.interner is not None,
                 )
+                futures.append(future)
+                in_flight.add(future)
 
-            # Create a list of dicts: Extract each file and load it as a dictionary
-            files = [json.loads(tarball.extractfile(file).read()) for file in json_files]  # type: ignore
+            harvested: list[dict[str, list]] = []
+            for future in futures:
+                found, stats = future.result()
+                harvested.append(found)
+                if self.interner:
+                    self.interner.add_stats(stats)
 
-        return files
+            return harvested
 
 
-# BROKEN, NOT IMPLEMENTED YET
 class ACIUntarXML(ACIUntarBase):
+    """
+    Extracts .xml files from an ACI XML backup file and returns them as a list of dictionaries,
+    in the same structure the JSON backups decode to: {"class": {"attributes": {...}, "children": [...]}}
+    Each file is parsed incrementally straight from the archive stream and every XML element is
+    discarded as soon as it has been converted, so no file is ever held as a whole DOM.
+    """
+
+    extension: str = ".xml"
+
     def _get_files_from_archive_(self) -> list:
-        return []
-
-
-#         files: list[dict] = []
-
-#         tarball: tarfile.TarFile
-#         with tarfile.open(self.file_name, "r") as tarball:
-#             # Create a list of XML files in the backup tarball
-#             xml_files: list = [
-#                 file for file in tarball.getnames() if file.endswith(".xml")
-#             ]
-
-#             if not xml_files:
-#                 raise ValueError(
-#                     "No XML files detected in the backup archive. The backup file might be a JSON backup."
-#                 )
-
-#             files = [xmltodict.parse(tarball.extractfile(file).read()) for file in xml_files]  # type: ignore
-
-#         # converted_files = [self._element_to_dict_(ET.fromstring(file)) for file in files]
-
-#         return files
-
-#     def _element_to_dict_(self, element: bytes) -> dict:
-#         result: dict = {}
-#         for child in element:
-#             if child:
-#                 if len(child) == 1 and child[0].tag == child.tag:
-#                     if child.tag in result:
-#                         if isinstance(result[child.tag], list):
-#                             result[child.tag].append(self._element_to_dict_(child))
-#                         else:
-#                             result[child.tag] = [
-#                                 result[child.tag],
-#                                 self._element_to_dict_(child),
-#                             ]
-#                     else:
-#                         result[child.tag] = self._element_to_dict_(child)
-#                 else:
-#                     if child.tag in result:
-#                         if not isinstance(result[child.tag], list):
-#                             result[child.tag] = [result[child.tag]]
-#                         result[child.tag].append(self._element_to_dict_(child))
-#                     else:
-#                         result[child.tag] = self._element_to_dict_(child)
-#             else:
-#                 result[child.tag] = child.text.strip() if child.text else None
-
-#         return result
+        files: list[dict] = [
+            self._intern_(self._parse_xml_(member_file))
+            for _, member_file in self._iter_members_(as_file=True)
+        ]
+
+        if not files:
+            raise ValueError(
+                "No XML files detected in the backup archive. The backup file might be a JSON backup."
+            )
+
+        return files
+
+    def _parse_xml_(self, xml_file: IO[bytes]) -> dict:
+        """
+        Converts an ACI XML config file to the JSON backup structure, element by element.
+        An element becomes {tag: {"attributes": {...}}} when it starts (attributes are complete
+        at that point), its children are appended to the "children" list of its body as they
+        start, and the element is removed from the tree when it ends.
+        """
+        document: dict = {}
+        bodies: list[dict] = []
+        elements: list[ET.Element] = []
+
+        event: str
+        element: ET.Element
+        for event, element in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                body: dict = {"attributes": dict(element.attrib)}
+                if bodies:
+                    bodies[-1].setdefault("children", []).append({element.tag: body})
+                else:
+                    document = {element.tag: body}
+                bodies.append(body)
+                elements.append(element)
+            else:
+                bodies.pop()
+                elements.pop()
+                element.clear()
+                if elements:
+                    # Already converted and its earlier siblings are gone, so this is O(1)
+                    elements[-1].remove(element)
+
+        return document
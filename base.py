@@ -1,6 +1,54 @@
-from typing import Iterator
+from typing import Iterable, Iterator
 from abc import ABC, abstractmethod
 
+from .indexes import ChildrenIndex, DNIndex, hash_subtrees, walk_managed_objects
+from .query import compile_path
+
+
+def harvest_keys(document: dict, keys: Iterable[str]) -> dict[str, list]:
+    """
+    Walks a nested dictionary (a decoded config file) one time and collects the
+    value of every occurrence of each of the requested keys.
+    Returns a dictionary of {key: [values in depth-first order]}.
+
+    Once a key is found, the search for that same key does not descend into its value,
+    but the search for the other keys does (e.g. infraFuncP is collected from inside infraInfra).
+    The "attributes" dictionaries only hold strings so they are never descended into.
+
+    Example usage:
+    harvest_keys(a_dictionary, ["fvTenant", "infraInfra"])
+
+    Would return:
+    {
+    "fvTenant": [{...}, {...}],
+    "infraInfra": [{...}]
+    }
+    """
+
+    wanted: frozenset = frozenset(keys)
+    found: dict[str, list] = {key: [] for key in wanted}
+
+    def walk(node: dict, suppressed: frozenset) -> None:
+        k: str
+        for k, v in node.items():
+            inner: frozenset = suppressed
+            if k in wanted and k not in suppressed:
+                found[k].append(v)
+                inner = suppressed | {k}
+            elif k == "attributes":
+                continue
+
+            if isinstance(v, dict):
+                walk(v, inner)
+            elif isinstance(v, list):
+                for d in v:
+                    if isinstance(d, dict):
+                        walk(d, inner)
+
+    walk(document, frozenset())
+
+    return found
+
 
 def dict_extractor(dictionary: dict, base_key: str, *args) -> list:
     """
@@ -31,30 +79,99 @@ def dict_extractor(dictionary: dict, base_key: str, *args) -> list:
       key3: {},
       key3: {}
     ]
+
+    The class path is compiled once (see query.compile_path) and reused on every later call.
+    If any object along the path is missing its 'children' an empty list is returned.
+    """
+
+    return compile_path(base_key, *args).run(dictionary)
+
+
+class RawConfigs(dict):
+    """
+    The root keys harvested from the backup (see ExtractInterestingKeys) along with
+    the indexes over them. Behaves exactly like the plain dictionary.
+    The children index is filled in as the extractors look children up (see ChildrenIndex)
+    and the DN index is built the first time it's used, so loading a backup doesn't walk
+    the whole managed object tree.
     """
 
-    list_comp_str: str
-    list_comp_str = f"[child{len(args)}['{args[-1]}']"
-    list_comp_str += f" for each in dictionary['{base_key}']"
-    i: int
-    each: str
-    for i, each in enumerate(args, start=1):
-        if i == 1:
-            list_comp_str += f" for child{i} in each['children']"
-        else:
-            list_comp_str += f" for child{i} in child{i-1}['{args[i-2]}']['children']"
-        list_comp_str += f" if '{each}' in child{i}"
-    list_comp_str += "]"
-
-    results: list
-    try:
-        results = eval(list_comp_str)
-    except KeyError:
-        results = []
-    except IndexError:
-        results = []
-
-    return results
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.children_index: ChildrenIndex = ChildrenIndex()
+        # DN -> subtree content hash, see hash_subtrees()
+        self.subtree_hashes: dict[str, bytes] | None = None
+        self._dn_index_: DNIndex | None = None
+
+    @property
+    def dn_index(self) -> DNIndex:
+        """The DN index of every managed object (see DNIndex), built by one walk of the tree on first use"""
+        if self._dn_index_ is None:
+            self._dn_index_ = DNIndex()
+
+            cls: str
+            dn: str
+            mo: dict
+            for cls, dn, _, mo in walk_managed_objects(self):
+                self._dn_index_.add(cls, dn, mo)
+
+        return self._dn_index_
+
+    def hash_subtrees(self) -> dict[str, bytes]:
+        """
+        Computes (once) the content hash of every managed object's subtree, keyed by DN
+        (see indexes.hash_subtrees). diff() skips the subtrees with equal hashes when
+        both backups have them.
+        """
+        if self.subtree_hashes is None:
+            self.subtree_hashes = hash_subtrees(self)
+
+        return self.subtree_hashes
+
+    def changed_keys(self, previous: "RawConfigs") -> set[str]:
+        """
+        Returns the root keys whose content differs from a previous backup's raw configs
+        (including the root keys only one of them has).
+        Compares the subtree hashes of the root objects when both have hashes (without walking
+        the objects), otherwise compares the managed objects themselves.
+        """
+        previous_hashes: dict[str, bytes] | None = getattr(
+            previous, "subtree_hashes", None
+        )
+        changed: set[str] = set()
+
+        key: str
+        for key in dict.fromkeys([*self, *previous]):
+            if key not in self or key not in previous:
+                changed.add(key)
+            elif self.subtree_hashes and previous_hashes:
+                root_hashes: list = [
+                    self.subtree_hashes.get(self.dn_index.dn_of(mo) or "")
+                    for mo in self[key]
+                ]
+                previous_root_hashes: list = [
+                    previous_hashes.get(previous.dn_index.dn_of(mo) or "")
+                    for mo in previous[key]
+                ]
+                if None in root_hashes or None in previous_root_hashes:
+                    # A root that isn't indexed (e.g. lazy tenants) is compared as is
+                    if self[key] != previous[key]:
+                        changed.add(key)
+                elif root_hashes != previous_root_hashes:
+                    changed.add(key)
+            elif self[key] != previous[key]:
+                changed.add(key)
+
+        return changed
+
+    def __reduce__(self) -> tuple:
+        # Indexes are keyed on object identity, so they are rebuilt on first use instead of
+        # pickled. The subtree hashes are keyed by DN and carried over as they are
+        return (
+            self.__class__,
+            (dict(self),),
+            {"subtree_hashes": self.subtree_hashes},
+        )
 
 
 class ParentExtractorBase(ABC):
@@ -64,16 +181,46 @@ class ParentExtractorBase(ABC):
     It is an aggregator (composition) for specific 'Child' Extractors that perform the config extractions.
     """
 
-    def __init__(self, raw_configs: dict) -> None:
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        """
+        :param raw_configs: The root keys harvested from the backup
+        :param previous: This section's output (to_dict()) for a previous backup of the same fabric
+        :param changed_keys: The root keys that changed since that previous backup. The child
+            extractors that don't depend on any of them reuse their previous output.
+        """
         self.raw_configs: dict = raw_configs
+        self._previous_: dict | None = previous
+        self._changed_keys_: frozenset[str] = frozenset(changed_keys or ())
         "Child Extractors will be implemented by subclasses via super()"
 
+    def _child_config_(
+        self, attribute: str, extractor: type["ChildExtractorBase"]
+    ) -> dict:
+        """
+        Returns the config of a child extractor, reusing the previous output of the attribute
+        when none of the root keys the child extractor depends on changed.
+        """
+        if (
+            self._previous_
+            and attribute in self._previous_
+            and extractor.depends_on
+            and self._changed_keys_.isdisjoint(extractor.depends_on)
+        ):
+            return self._previous_[attribute]
+
+        return extractor(self.raw_configs).config
+
     @abstractmethod
     def __str__(self) -> str:
         pass
 
     def __iter__(self) -> Iterator:
-        exclude_attributes: list = ["raw_configs"]
+        exclude_attributes: list = ["raw_configs", "_previous_", "_changed_keys_"]
         keys_to_iterate: list = [
             key for key in self.__dict__.keys() if not key in exclude_attributes
         ]
@@ -93,6 +240,10 @@ class ChildExtractorBase(ABC):
     It holds the logic for the config extraction and roll up to Parent Extractors via composition.
     """
 
+    # The root keys of the raw configs the extractor reads. Its output is reused for a new
+    # backup when none of them changed (see ParentExtractorBase). Empty means always re-extract.
+    depends_on: tuple[str, ...] = ()
+
     def __init__(self, raw_configs: dict) -> None:
         self.raw_configs: dict = raw_configs
         self.config: dict = {}
@@ -103,3 +254,15 @@ class ChildExtractorBase(ABC):
     def _extract_config_(self) -> None:
         """Extraction logic implemented by subclasses"""
         pass
+
+    def _children_(self, mo: dict, cls: str) -> list:
+        """
+        Returns the children of a managed object that are of the given class.
+        Uses the raw configs' children index when there is one, otherwise scans the children.
+        Raises a KeyError if the object has no children.
+        """
+        index: ChildrenIndex | None = getattr(self.raw_configs, "children_index", None)
+        if index is None:
+            return [child[cls] for child in mo["children"] if cls in child]
+
+        return index.children(mo, cls)
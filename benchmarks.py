@@ -0,0 +1,300 @@
+"""
+Benchmarks for aciextract.
+Run from the directory containing the aciextract package with:
+    python -m aciextract.benchmarks
+    python -m aciextract.benchmarks --sizes small medium large --output results.json
+    python -m aciextract.benchmarks --compare results.json
+    python -m aciextract.benchmarks --decoders
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tarfile
+import tempfile
+import time
+import timeit
+from typing import Any, Callable
+
+from . import ACIConfig
+from .base import ParentExtractorBase, RawConfigs
+from .decoders import JSONDecoder, available_decoders, get_decoder
+from .extractor_classes import (
+    ExtractAccessPolicies,
+    ExtractFabricDetails,
+    ExtractFabricPolicies,
+    ExtractInterestingKeys,
+    ExtractSystemSettings,
+    ExtractTenantPolicies,
+)
+from .synthetic import FABRIC_SIZES, SyntheticBackup
+from .version import __version__
+
+# The section extractors, in ACIConfig.section_attributes order
+SECTION_EXTRACTORS: dict[str, type[ParentExtractorBase]] = {
+    "fabric_details": ExtractFabricDetails,
+    "system_settings": ExtractSystemSettings,
+    "fabric_policies": ExtractFabricPolicies,
+    "access_policies": ExtractAccessPolicies,
+    "tenant_policies": ExtractTenantPolicies,
+}
+
+# A stage is reported as a regression when it gets slower than this (0.1 = 10% slower)
+DEFAULT_THRESHOLD: float = 0.1
+# ... and by more than this many seconds, the stages that only take microseconds are noisy
+MIN_DIFFERENCE: float = 0.001
+
+
+def _read_archive_(backup_file: str) -> list[bytes]:
+    """Returns the bytes of every JSON file of the archive, streamed like ACIUntarBase reads it"""
+    with tarfile.open(backup_file, "r|*") as tarball:
+        return [
+            tarball.extractfile(member).read()  # type: ignore
+            for member in tarball
+            if member.isfile() and member.name.endswith(".json")
+        ]
+
+
+def benchmark_stages(
+    backup_file: str, rounds: int = 3, decoder: str | None = None
+) -> dict[str, Any]:
+    """
+    Times each stage of parsing a backup, the same steps ACIConfig goes through:
+    archive_read (decompress the members), decode (JSON), key_harvest (ExtractInterestingKeys),
+    indexes (building RawConfigs' DN index, which by_dn() and the exports use), one stage per
+    section extractor (including filling in the children index for the objects it visits),
+    then end_to_end (ACIConfig(backup_file).to_dict() as a whole).
+    Every round runs every stage once. Returns {"managed_objects": ..., "stages": {stage: best time in seconds}}.
+    """
+    json_decoder: JSONDecoder = get_decoder(decoder)
+    stages: dict[str, float] = {}
+    managed_objects: int = 0
+
+    def timed(stage: str, function: Callable[[], Any]) -> Any:
+        start: float = time.perf_counter()
+        result: Any = function()
+        seconds: float = time.perf_counter() - start
+        stages[stage] = min(stages.get(stage, seconds), seconds)
+        return result
+
+    for _ in range(rounds):
+        gc.collect()
+        data: list[bytes] = timed("archive_read", lambda: _read_archive_(backup_file))
+        files: list[dict] = timed(
+            "decode", lambda: [json_decoder.loads(member) for member in data]
+        )
+        harvested: dict = timed(
+            "key_harvest", lambda: ExtractInterestingKeys(files).to_dict()
+        )
+        raw_configs: RawConfigs = RawConfigs(harvested)
+        managed_objects = len(timed("indexes", lambda: raw_configs.dn_index))
+
+        section: str
+        extractor: type[ParentExtractorBase]
+        for section, extractor in SECTION_EXTRACTORS.items():
+            timed(f"section.{section}", lambda: extractor(raw_configs).to_dict())
+
+        del data, files, harvested, raw_configs
+        gc.collect()
+        timed(
+            "end_to_end",
+            lambda: ACIConfig(backup_file, decoder=json_decoder.name).to_dict(),
+        )
+
+    return {"managed_objects": managed_objects, "stages": stages}
+
+
+def run_benchmarks(
+    sizes: list[str], rounds: int = 3, decoder: str | None = None
+) -> dict[str, Any]:
+    """
+    Writes a synthetic backup of each fabric size (see synthetic.FABRIC_SIZES) to a temporary
+    directory and times the stages of parsing it (see benchmark_stages).
+    Returns the results along with what they were measured on, ready to be saved as JSON
+    and compared with a later run (see compare_results).
+    """
+    results: dict[str, Any] = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "decoder": get_decoder(decoder).name,
+        "rounds": rounds,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sizes": {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        size: str
+        for size in sizes:
+            backup: SyntheticBackup = SyntheticBackup(**FABRIC_SIZES[size])
+            backup_file: str = os.path.join(directory, f"{size}.tar.gz")
+            json_bytes: int = backup.write(backup_file)
+
+            results["sizes"][size] = {
+                "parameters": backup.to_dict(),
+                "json_bytes": json_bytes,
+                "archive_bytes": os.path.getsize(backup_file),
+                **benchmark_stages(backup_file, rounds, decoder),
+            }
+
+    return results
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    results: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """
+    Compares the stage times of two runs (see run_benchmarks), for the sizes and stages both have.
+    Returns one {"size", "stage", "baseline", "current", "ratio", "regression"} row per stage,
+    a regression being a stage more than threshold (and MIN_DIFFERENCE) slower than in the baseline.
+    """
+    rows: list[dict[str, Any]] = []
+
+    size: str
+    for size, result in results["sizes"].items():
+        baseline_stages: dict[str, float] = (
+            baseline["sizes"].get(size, {}).get("stages", {})
+        )
+        stage: str
+        seconds: float
+        for stage, seconds in result["stages"].items():
+            if stage not in baseline_stages:
+                continue
+            ratio: float = seconds / baseline_stages[stage]
+            rows.append(
+                {
+                    "size": size,
+                    "stage": stage,
+                    "baseline": baseline_stages[stage],
+                    "current": seconds,
+                    "ratio": ratio,
+                    "regression": ratio > 1 + threshold
+                    and seconds - baseline_stages[stage] > MIN_DIFFERENCE,
+                }
+            )
+
+    return rows
+
+
+def benchmark_decoders(data: bytes, rounds: int = 5) -> dict[str, float]:
+    """
+    Times each installed JSON decoder backend decoding the same archive member bytes.
+    Returns {decoder name: best time in seconds}.
+    """
+    results: dict[str, float] = {}
+
+    name: str
+    for name in available_decoders():
+        loads = get_decoder(name).loads
+        results[name] = min(timeit.repeat(lambda: loads(data), number=1, repeat=rounds))
+
+    return results
+
+
+def _print_decoders_() -> None:
+    # The tenants file of a large synthetic backup
+    data: bytes = max(
+        (
+            json.dumps(document).encode()
+            for _, document in SyntheticBackup(**FABRIC_SIZES["large"]).iter_files()
+        ),
+        key=len,
+    )
+    print(f"JSON decoders ({len(data) / 1024**2:.1f} MB synthetic backup file)")
+
+    results: dict[str, float] = benchmark_decoders(data)
+    baseline: float = results["json"]
+    name: str
+    seconds: float
+    for name, seconds in results.items():
+        print(f"  {name:<8} {seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+def _print_results_(results: dict[str, Any]) -> None:
+    print(
+        f"aciextract {results['version']}, Python {results['python']}, "
+        f"{results['decoder']} decoder, best of {results['rounds']}"
+    )
+
+    size: str
+    for size, result in results["sizes"].items():
+        print(
+            f"{size}: {result['managed_objects']} managed objects, "
+            f"{result['json_bytes'] / 1024**2:.1f} MB of JSON"
+        )
+        stage: str
+        seconds: float
+        for stage, seconds in result["stages"].items():
+            print(f"  {stage:<32} {seconds * 1000:10.1f} ms")
+
+
+def _print_comparison_(rows: list[dict[str, Any]]) -> None:
+    print("Compared with the baseline")
+
+    row: dict[str, Any]
+    for row in rows:
+        print(
+            f"  {row['size']:<8} {row['stage']:<32} {row['baseline'] * 1000:10.1f} ms"
+            f" -> {row['current'] * 1000:10.1f} ms  {row['ratio']:5.2f}x"
+            + ("  REGRESSION" if row["regression"] else "")
+        )
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Time each stage of parsing synthetic ACI backups of several sizes"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(FABRIC_SIZES),
+        default=["small", "medium", "large"],
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--decoder", help="JSON decoder backend, defaults to the fastest installed"
+    )
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        help="Compare with the results saved by an earlier run, exits with 1 on a regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown reported as a regression (0.1 = 10%% slower)",
+    )
+    parser.add_argument(
+        "--decoders",
+        action="store_true",
+        help="Only compare the installed JSON decoder backends",
+    )
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.decoders:
+        _print_decoders_()
+        sys.exit(0)
+
+    results: dict[str, Any] = run_benchmarks(
+        arguments.sizes, arguments.rounds, arguments.decoder
+    )
+    _print_results_(results)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as f:
+            rows: list[dict[str, Any]] = compare_results(
+                json.load(f), results, arguments.threshold
+            )
+        _print_comparison_(rows)
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from .version import __version__
+
+# Bumped whenever the layout of the cached entries changes (the raw configs' representation,
+# subtree hashes, the cached sections), so entries written by an older layout are never read
+CACHE_FORMAT_VERSION: int = 2
+
+
+class ParseCache:
+    """
+    An on-disk cache of parsed backups.
+    Entries are keyed by the SHA-256 of the backup archive plus the library version and the
+    cache format version, so a changed backup, a new version of aciextract or a new entry
+    layout never reads a stale entry.
+    Entries are pickled (a fast binary format that preserves shared sub-objects) and the
+    directory is kept under max_bytes by evicting the least recently used entries.
+
+    NOTE: Entries are unpickled on load, so only point the cache at a directory you trust.
+    """
+
+    suffix: str = ".pickle"
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 2 * 1024**3,
+        store_sections: bool = False,
+    ) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        # Also cache the extracted sections (forces them to be extracted when storing)
+        self.store_sections: bool = store_sections
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __str__(self) -> str:
+        return self.directory
+
+    def key(self, backup_file: str) -> str:
+        """Returns the cache key for a backup archive (hash of its contents + library and cache format versions)"""
+        with open(backup_file, "rb") as f:
+            digest: str = hashlib.file_digest(f, "sha256").hexdigest()
+
+        return f"{digest}-{__version__}-v{CACHE_FORMAT_VERSION}"
+
+    def _path_(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def load(self, key: str) -> dict | None:
+        """Returns the cached entry for the key, or None on a cache miss"""
+        path: str = self._path_(key)
+        try:
+            with open(path, "rb") as f:
+                entry: dict = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Unreadable or truncated entry, drop it and treat it as a miss
+            self._remove_(path)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+
+        return entry
+
+    def store(self, key: str, entry: dict) -> None:
+        """Writes an entry to the cache and evicts old entries if the cache is over size"""
+        fd: int
+        tmp_path: str
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic, so concurrent readers never see a partial entry
+            os.replace(tmp_path, self._path_(key))
+        except BaseException:
+            self._remove_(tmp_path)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache fits in max_bytes"""
+        entries: list[tuple[float, int, str]] = []
+
+        entry: os.DirEntry
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix):
+                stat: os.stat_result = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total: int = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove_(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Removes every entry from the cache"""
+        entry: os.DirEntry
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix):
+                self._remove_(entry.path)
+
+    def _remove_(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,77 @@
+import importlib
+import json
+from typing import Any, Callable
+
+# Decoders in order of preference, the first one that is installed is the default.
+# The stdlib json module is always available as the fallback.
+PREFERRED_DECODERS: tuple[str, ...] = ("orjson", "ujson", "json")
+
+
+class JSONDecoder:
+    """
+    A JSON decoding backend. loads() accepts the raw bytes of an archive member (or a str),
+    the faster backends parse the bytes directly without decoding them to a str first.
+    Decoding errors are raised as ValueError (json.JSONDecodeError is a ValueError).
+    """
+
+    __slots__ = ("name", "loads")
+
+    def __init__(self, name: str, loads: Callable[[bytes | str], Any]) -> None:
+        self.name: str = name
+        self.loads: Callable[[bytes | str], Any] = loads
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"JSONDecoder({self.name})"
+
+
+def _import_decoder_(name: str) -> JSONDecoder | None:
+    """Returns the decoder backend, or None if it isn't installed"""
+    if name == "json":
+        return JSONDecoder("json", json.loads)
+
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+
+    return JSONDecoder(name, module.loads)
+
+
+def available_decoders() -> list[str]:
+    """Returns the names of the installed decoder backends, in order of preference"""
+    return [name for name in PREFERRED_DECODERS if _import_decoder_(name)]
+
+
+def get_decoder(name: str | None = None) -> JSONDecoder:
+    """
+    Returns the named decoder backend, or the preferred installed one when no name is given.
+    Raises ValueError for an unknown or uninstalled backend.
+    """
+    if name is None:
+        return _default_decoder_
+
+    if name not in PREFERRED_DECODERS:
+        raise ValueError(
+            f"Unknown JSON decoder '{name}', expected one of {PREFERRED_DECODERS}"
+        )
+
+    decoder: JSONDecoder | None = _import_decoder_(name)
+    if decoder is None:
+        raise ValueError(f"JSON decoder '{name}' is not installed")
+
+    return decoder
+
+
+_default_decoder_: JSONDecoder = next(
+    decoder
+    for decoder in map(_import_decoder_, PREFERRED_DECODERS)
+    if decoder is not None
+)
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON with the preferred installed decoder backend"""
+    return _default_decoder_.loads(data)
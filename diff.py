@@ -0,0 +1,163 @@
+from typing import Any, Iterable, Iterator
+
+from .indexes import ROOT_PARENT_DNS, child_dns
+
+
+def _raw_configs_(config: Any) -> dict:
+    """Accepts an ACIConfig or its raw_configs"""
+    return getattr(config, "raw_configs", config)
+
+
+def _keyed_children_(parent_dn: str, body: Any) -> dict[str, tuple[str, Any]]:
+    """
+    Returns {dn: (class name, body)} for the children of a managed object, in document order.
+    Siblings sharing a DN are told apart by their position (see indexes.child_dns), so none
+    of them is dropped.
+    """
+    if body is None:
+        return {}
+
+    return {
+        dn: (cls, child_body)
+        for cls, dn, child_body in child_dns(parent_dn, body.get("children", ()))
+    }
+
+
+def _pairs_(
+    children_a: dict[str, tuple[str, Any]], children_b: dict[str, tuple[str, Any]]
+) -> list[tuple[str, str, Any, Any]]:
+    """
+    Matches the children of a pair of objects by DN.
+    Returns (class name, dn, body in a or None, body in b or None) tuples in reverse order
+    (ready to be pushed on a stack): the children of a in document order, then the
+    children only found in b.
+    """
+    pairs: list[tuple[str, str, Any, Any]] = [
+        (cls, dn, body, children_b.get(dn, (None, None))[1])
+        for dn, (cls, body) in children_a.items()
+    ]
+    pairs.extend(
+        (cls, dn, None, body)
+        for dn, (cls, body) in children_b.items()
+        if dn not in children_a
+    )
+    # Reversed, so popping from the end takes them in the order above
+    pairs.reverse()
+
+    return pairs
+
+
+def _attribute_changes_(
+    attributes_a: dict, attributes_b: dict, ignore: frozenset[str]
+) -> dict[str, list]:
+    """Returns {attribute: [value in a, value in b]} for the attributes that differ (None when missing)"""
+    if attributes_a == attributes_b:
+        return {}
+
+    return {
+        key: [attributes_a.get(key), attributes_b.get(key)]
+        for key in dict.fromkeys([*attributes_a, *attributes_b])
+        if key not in ignore and attributes_a.get(key) != attributes_b.get(key)
+    }
+
+
+def diff(
+    config_a: Any, config_b: Any, ignore_attributes: Iterable[str] = ()
+) -> Iterator[dict]:
+    """
+    Compares two backups (ACIConfigs or their raw_configs) managed object by managed object
+    and yields a record for every object that was added, removed or modified:
+    {"section": root key, "change": "added" | "removed" | "modified", "class": ..., "dn": ...,
+     "attributes": ...}
+    For a modified object 'attributes' holds {attribute: [value in a, value in b]} for the
+    attributes that changed. For an added or removed object it holds the object's attributes
+    (every object of an added or removed subtree gets its own record).
+
+    Both trees are walked top-down side by side and the children of each pair of objects are
+    matched by DN, so the run time is linear in the size of the backups and records are
+    yielded as they are found.
+    When both backups have subtree hashes (see RawConfigs.hash_subtrees, or
+    ACIConfig(..., hash_subtrees=True)), subtrees with equal hashes are skipped without
+    being walked, so the run time is proportional to the parts of the backups that changed.
+    Root keys harvested inside other root keys (e.g. infraFuncP inside infraInfra) are only
+    compared once, under the shallowest root key.
+
+    :param ignore_attributes: Attributes to leave out of the comparison (e.g. "modTs")
+    """
+    ignore: frozenset[str] = frozenset(ignore_attributes)
+    raw_a: dict = _raw_configs_(config_a)
+    raw_b: dict = _raw_configs_(config_b)
+    hashes_a: dict[str, bytes] = getattr(raw_a, "subtree_hashes", None) or {}
+    hashes_b: dict[str, bytes] = getattr(raw_b, "subtree_hashes", None) or {}
+    if not (hashes_a and hashes_b):
+        hashes_a = hashes_b = {}
+    # ids of the objects already compared, so nested root keys aren't compared twice
+    seen: set[int] = set()
+
+    section: str
+    for section in sorted(
+        dict.fromkeys([*raw_a, *raw_b]),
+        key=lambda key: ROOT_PARENT_DNS.get(key, "").count("/"),
+    ):
+        parent_dn: str = ROOT_PARENT_DNS.get(section, "")
+        roots_a: dict[str, tuple[str, Any]] = _keyed_children_(
+            parent_dn, {"children": [{section: mo} for mo in raw_a.get(section, [])]}
+        )
+        roots_b: dict[str, tuple[str, Any]] = _keyed_children_(
+            parent_dn, {"children": [{section: mo} for mo in raw_b.get(section, [])]}
+        )
+
+        # (class name, dn, body in a or None, body in b or None), popped in document order
+        # with the objects only found in b last
+        stack: list[tuple[str, str, Any, Any]] = _pairs_(roots_a, roots_b)
+
+        while stack:
+            cls, dn, body_a, body_b = stack.pop()
+            if dn in hashes_a and hashes_a[dn] == hashes_b.get(dn):
+                # Identical subtrees
+                continue
+            if (body_a is None or id(body_a) in seen) and (
+                body_b is None or id(body_b) in seen
+            ):
+                continue
+            seen.update(id(body) for body in (body_a, body_b) if body is not None)
+
+            record: dict = {"section": section, "class": cls, "dn": dn}
+            if body_b is None:
+                yield {
+                    **record,
+                    "change": "removed",
+                    "attributes": body_a.get("attributes", {}),
+                }
+            elif body_a is None:
+                yield {
+                    **record,
+                    "change": "added",
+                    "attributes": body_b.get("attributes", {}),
+                }
+            else:
+                changes: dict = _attribute_changes_(
+                    body_a.get("attributes", {}), body_b.get("attributes", {}), ignore
+                )
+                if changes:
+                    yield {**record, "change": "modified", "attributes": changes}
+
+            stack.extend(
+                _pairs_(_keyed_children_(dn, body_a), _keyed_children_(dn, body_b))
+            )
+
+
+def diff_summary(
+    config_a: Any, config_b: Any, ignore_attributes: Iterable[str] = ()
+) -> dict[str, dict[str, int]]:
+    """Returns the number of added, removed and modified objects per section (see diff())"""
+    summary: dict[str, dict[str, int]] = {}
+
+    record: dict
+    for record in diff(config_a, config_b, ignore_attributes):
+        counts: dict[str, int] = summary.setdefault(
+            record["section"], {"added": 0, "removed": 0, "modified": 0}
+        )
+        counts[record["change"]] += 1
+
+    return summary
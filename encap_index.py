@@ -0,0 +1,256 @@
+import heapq
+from typing import Iterator
+
+from .base import RawConfigs, dict_extractor
+
+# Encapsulation type -> (pool class, encap block class) under infraInfra
+ENCAP_POOLS: dict[str, tuple[str, str]] = {
+    "vlan": ("fvnsVlanInstP", "fvnsEncapBlk"),
+    "vxlan": ("fvnsVxlanInstP", "fvnsEncapBlk"),
+    "vsan": ("fvnsVsanInstP", "fvnsVsanEncapBlk"),
+}
+
+# Domain root keys, and the classes of the relations from a domain to its pools
+DOMAIN_ROOT_KEYS: tuple[str, ...] = ("physDomP", "l2extDomP", "l3extDomP", "fcDomP")
+POOL_RELATIONS: tuple[str, ...] = ("infraRsVlanNs", "infraRsVxlanNs", "infraRsVsanNs")
+
+
+def encap_number(encap: str) -> int:
+    """Returns the number of an encapsulation ('vlan-100' -> 100)"""
+    return int(encap.rsplit("-", 1)[-1])
+
+
+class EncapBlock:
+    """One encap block (inclusive range of VLANs, VXLANs or VSANs) of a pool"""
+
+    __slots__ = ("encap", "first", "last", "pool", "alloc_mode")
+
+    def __init__(
+        self, encap: str, first: int, last: int, pool: str, alloc_mode: str
+    ) -> None:
+        self.encap: str = encap
+        self.first: int = first
+        self.last: int = last
+        self.pool: str = pool
+        self.alloc_mode: str = alloc_mode
+
+    def __repr__(self) -> str:
+        return f"EncapBlock({self.encap}-{self.first}..{self.last} in {self.pool})"
+
+    def to_dict(self) -> dict:
+        return {
+            "encap": self.encap,
+            "from": self.first,
+            "to": self.last,
+            "pool": self.pool,
+            "alloc_mode": self.alloc_mode,
+        }
+
+
+class _IntervalNode:
+    """
+    A node of a centered interval tree. Holds the blocks that contain its center, sorted
+    by first and by last, and the subtrees of the blocks entirely left or right of it.
+    """
+
+    __slots__ = ("center", "by_first", "by_last", "left", "right")
+
+    def __init__(self, blocks: list[EncapBlock]) -> None:
+        firsts: list[int] = sorted(block.first for block in blocks)
+        self.center: int = firsts[len(firsts) // 2]
+
+        here: list[EncapBlock] = []
+        left: list[EncapBlock] = []
+        right: list[EncapBlock] = []
+        block: EncapBlock
+        for block in blocks:
+            if block.last < self.center:
+                left.append(block)
+            elif block.first > self.center:
+                right.append(block)
+            else:
+                here.append(block)
+
+        self.by_first: list[EncapBlock] = sorted(here, key=lambda b: b.first)
+        self.by_last: list[EncapBlock] = sorted(here, key=lambda b: -b.last)
+        self.left: _IntervalNode | None = _IntervalNode(left) if left else None
+        self.right: _IntervalNode | None = _IntervalNode(right) if right else None
+
+    def overlapping(self, first: int, last: int) -> Iterator[EncapBlock]:
+        """Yields the blocks that overlap the inclusive range first..last"""
+        block: EncapBlock
+        if last < self.center:
+            # Only the blocks here that start early enough overlap
+            for block in self.by_first:
+                if block.first > last:
+                    break
+                yield block
+            if self.left:
+                yield from self.left.overlapping(first, last)
+        elif first > self.center:
+            # Only the blocks here that end late enough overlap
+            for block in self.by_last:
+                if block.last < first:
+                    break
+                yield block
+            if self.right:
+                yield from self.right.overlapping(first, last)
+        else:
+            # The range contains the center, so does every block here
+            yield from self.by_first
+            if self.left:
+                yield from self.left.overlapping(first, last)
+            if self.right:
+                yield from self.right.overlapping(first, last)
+
+
+class EncapIndex:
+    """
+    An interval index over the encap blocks of every VLAN, VXLAN and VSAN pool.
+    Finding the pools (and the domains using them) that contain an encapsulation, or the
+    blocks overlapping a range, is a walk down a centered interval tree: O(log n + matches).
+    overlaps() reports every pair of overlapping blocks from different pools with a
+    single sweep over the sorted blocks.
+
+    Example usage:
+    index = config.encap_index
+    index.pools("vlan", 100)  # DNs of the VLAN pools containing VLAN 100
+    index.domains("vlan", 100)  # DNs of the domains using those pools
+    index.overlap_report()
+    """
+
+    def __init__(self, raw_configs: RawConfigs) -> None:
+        self.raw_configs: RawConfigs = raw_configs
+        # Encapsulation type -> blocks, sorted by (first, last)
+        self.blocks: dict[str, list[EncapBlock]] = {}
+        # Pool DN -> DNs of the domains pointing to the pool
+        self.pool_domains: dict[str, list[str]] = {}
+        self._trees_: dict[str, _IntervalNode | None] = {}
+
+        self._index_blocks_()
+        self._index_domains_()
+
+    def __str__(self) -> str:
+        return "EncapIndex"
+
+    def __len__(self) -> int:
+        return sum(len(blocks) for blocks in self.blocks.values())
+
+    def _children_of_(self, mo: dict, cls: str) -> list:
+        if "children" not in mo:
+            return []
+
+        return self.raw_configs.children_index.children(mo, cls)
+
+    def _index_blocks_(self) -> None:
+        encap: str
+        pool_cls: str
+        block_cls: str
+        for encap, (pool_cls, block_cls) in ENCAP_POOLS.items():
+            blocks: list[EncapBlock] = []
+
+            pool: dict
+            for pool in dict_extractor(self.raw_configs, "infraInfra", pool_cls):
+                pool_dn: str = self.raw_configs.dn_index.dn_of(pool) or ""
+                pool_mode: str = pool["attributes"].get("allocMode", "")
+                block: dict
+                for block in self._children_of_(pool, block_cls):
+                    attributes: dict = block["attributes"]
+                    alloc_mode: str = attributes.get("allocMode", "inherit")
+                    blocks.append(
+                        EncapBlock(
+                            encap,
+                            encap_number(attributes["from"]),
+                            encap_number(attributes["to"]),
+                            pool_dn,
+                            pool_mode if alloc_mode == "inherit" else alloc_mode,
+                        )
+                    )
+
+            blocks.sort(key=lambda b: (b.first, b.last))
+            self.blocks[encap] = blocks
+            self._trees_[encap] = _IntervalNode(blocks) if blocks else None
+
+    def _index_domains_(self) -> None:
+        domains: list = [
+            domain
+            for root_key in DOMAIN_ROOT_KEYS
+            for domain in self.raw_configs.get(root_key, [])
+        ] + dict_extractor(self.raw_configs, "vmmProvP", "vmmDomP")
+
+        domain: dict
+        for domain in domains:
+            domain_dn: str = self.raw_configs.dn_index.dn_of(domain) or ""
+            relation_cls: str
+            for relation_cls in POOL_RELATIONS:
+                for relation in self._children_of_(domain, relation_cls):
+                    self.pool_domains.setdefault(
+                        relation["attributes"].get("tDn", ""), []
+                    ).append(domain_dn)
+
+    def overlapping(
+        self, encap: str, first: int, last: int | None = None
+    ) -> list[EncapBlock]:
+        """Returns the blocks of the encapsulation type ("vlan", "vxlan" or "vsan") overlapping first..last"""
+        tree: _IntervalNode | None = self._trees_.get(encap)
+        if tree is None:
+            return []
+
+        return sorted(
+            tree.overlapping(first, first if last is None else last),
+            key=lambda b: (b.first, b.last),
+        )
+
+    def pools(self, encap: str, number: int) -> list[str]:
+        """Returns the DNs of the pools containing the encapsulation (e.g. "vlan", 100)"""
+        return list(
+            dict.fromkeys(block.pool for block in self.overlapping(encap, number))
+        )
+
+    def domains(self, encap: str, number: int) -> list[str]:
+        """Returns the DNs of the domains whose pools contain the encapsulation (e.g. "vlan", 100)"""
+        return list(
+            dict.fromkeys(
+                domain
+                for pool in self.pools(encap, number)
+                for domain in self.pool_domains.get(pool, [])
+            )
+        )
+
+    def overlaps(
+        self, encap: str | None = None
+    ) -> Iterator[tuple[EncapBlock, EncapBlock]]:
+        """
+        Yields every pair of overlapping blocks from different pools, for one encapsulation
+        type or all of them. Sweeps the blocks in order of their first encapsulation while
+        keeping the blocks still open in a heap: O(n log n + overlapping pairs).
+        """
+        encap_type: str
+        for encap_type in [encap] if encap else list(self.blocks):
+            active: list[tuple[int, int, EncapBlock]] = []
+
+            position: int
+            block: EncapBlock
+            for position, block in enumerate(self.blocks.get(encap_type, [])):
+                while active and active[0][0] < block.first:
+                    heapq.heappop(active)
+                for _, _, other in active:
+                    if other.pool != block.pool:
+                        yield other, block
+                heapq.heappush(active, (block.last, position, block))
+
+    def overlap_report(self, encap: str | None = None) -> list[dict]:
+        """Returns the overlapping blocks from different pools (see overlaps()) with the domains of each pool"""
+        return [
+            {
+                "encap": block_a.encap,
+                "from": max(block_a.first, block_b.first),
+                "to": min(block_a.last, block_b.last),
+                "blocks": [block_a.to_dict(), block_b.to_dict()],
+                "domains": {
+                    pool: self.pool_domains.get(pool, [])
+                    for pool in (block_a.pool, block_b.pool)
+                },
+            }
+            for block_a, block_b in self.overlaps(encap)
+        ]
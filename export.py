@@ -0,0 +1,375 @@
+import gzip
+import json
+import sqlite3
+from collections.abc import Mapping
+from typing import IO, Any, Iterable, Iterator
+
+from .indexes import ROOT_PARENT_DNS, child_dns, walk_managed_objects
+from .managed_object import json_default
+from .tenant_collection import TenantCollection
+
+SQLITE_SCHEMA: tuple[str, ...] = (
+    "DROP TABLE IF EXISTS attribute",
+    "DROP TABLE IF EXISTS mo",
+    """CREATE TABLE mo (
+        id INTEGER PRIMARY KEY,
+        class TEXT NOT NULL,
+        dn TEXT NOT NULL,
+        parent_dn TEXT NOT NULL,
+        name TEXT
+    )""",
+    """CREATE TABLE attribute (
+        mo_id INTEGER NOT NULL REFERENCES mo (id),
+        name TEXT NOT NULL,
+        value TEXT
+    )""",
+)
+
+# Created after the rows are inserted, building an index once is faster than updating it per row
+SQLITE_INDEXES: tuple[str, ...] = (
+    "CREATE INDEX mo_class ON mo (class)",
+    "CREATE INDEX mo_dn ON mo (dn)",
+    "CREATE INDEX mo_parent_dn ON mo (parent_dn)",
+    "CREATE INDEX mo_name ON mo (name)",
+    "CREATE INDEX attribute_mo_id ON attribute (mo_id)",
+    "CREATE INDEX attribute_name_value ON attribute (name, value)",
+)
+
+
+def walk_all_managed_objects(
+    raw_configs: dict,
+) -> Iterator[tuple[str, str, str, str, dict]]:
+    """
+    Like indexes.walk_managed_objects, walks every managed object in the raw configs,
+    including the tenants of a TenantCollection (lazy tenants), which are decoded one at a time.
+    Yields (section, class name, dn, parent dn, managed object), the section being the root
+    key whose objects are being walked.
+    Root keys are walked from the shallowest to the deepest, and the objects of a root key
+    harvested from inside another one's objects (e.g. mgmtMgmtP in the mgmt tenant, infraFuncP
+    in infraInfra) are only yielded once, in that other root key's section. The same records
+    come out in the same order whether or not the tenants are lazy.
+    """
+    # The DNs the root keys' objects are found under
+    root_parent_dns: set[str] = {ROOT_PARENT_DNS.get(key, "") for key in raw_configs}
+    # DNs of the objects found directly under one of those so far, the roots of the deeper
+    # root keys that are among them were already walked
+    walked_dns: set[str] = set()
+
+    root_key: str
+    for root_key in sorted(
+        raw_configs, key=lambda key: ROOT_PARENT_DNS.get(key, "").count("/")
+    ):
+        roots: list | TenantCollection = raw_configs[root_key]
+        trees: Iterable[dict]
+        if isinstance(roots, TenantCollection):
+            trees = ({root_key: [tenant]} for _, tenant in roots.stream())
+        elif isinstance(roots, list):
+            trees = [
+                {
+                    root_key: [
+                        mo
+                        for _, dn, mo in child_dns(
+                            ROOT_PARENT_DNS.get(root_key, ""),
+                            [{root_key: mo} for mo in roots if isinstance(mo, Mapping)],
+                        )
+                        if dn not in walked_dns
+                    ]
+                }
+            ]
+        else:
+            continue
+
+        tree: dict
+        cls: str
+        dn: str
+        parent_dn: str
+        mo: dict
+        for tree in trees:
+            for cls, dn, parent_dn, mo in walk_managed_objects(tree):
+                if parent_dn in root_parent_dns:
+                    walked_dns.add(dn)
+                yield root_key, cls, dn, parent_dn, mo
+
+
+def iter_managed_objects(raw_configs: dict) -> Iterator[dict]:
+    """
+    Yields a record for every managed object of the raw configs (see walk_all_managed_objects):
+    {"section": root key, "class": ..., "dn": ..., "parent_dn": ..., "attributes": {...}}
+    """
+    section: str
+    cls: str
+    dn: str
+    parent_dn: str
+    mo: dict
+    for section, cls, dn, parent_dn, mo in walk_all_managed_objects(raw_configs):
+        yield {
+            "section": section,
+            "class": cls,
+            "dn": dn,
+            "parent_dn": parent_dn,
+            "attributes": mo.get("attributes", {}),
+        }
+
+
+def iter_section_objects(config: Any) -> Iterator[dict]:
+    """
+    Yields a record for every managed object held by the extracted sections of an ACIConfig
+    (extracting them one at a time as the walk reaches them), and for their descendants:
+    {"section": "access_policies.policies_interface.cdp", "class": ..., "dn": ..., "parent_dn": ...,
+     "attributes": {...}}
+    The section is the path of the object in the section's output. An object is anything
+    holding "attributes" (the managed objects, and e.g. the tenant_policies records). Its class
+    and DN come from the raw configs' DN index (or the record's own "dn"), None when unknown.
+    """
+    dn_index = getattr(config.raw_configs, "dn_index", None)
+    # DN -> class name of the lazy tenants' objects (they aren't in the DN index), on first miss
+    lazy_classes: dict[str, str] | None = None
+
+    section: str
+    for section in config.section_attributes:
+        # (path, value) to search, (path, class name, dn, parent dn, object) for the descendants
+        stack: list[tuple] = [(section, getattr(config, section))]
+        while stack:
+            entry: tuple = stack.pop()
+            if len(entry) == 5:
+                path, cls, dn, parent_dn, mo = entry
+                yield _object_record_(path, cls, dn, parent_dn, mo)
+                stack.extend(_child_entries_(path, dn, mo))
+                continue
+
+            path, value = entry
+            if isinstance(value, Mapping) and "attributes" in value:
+                dn = value.get("dn") or (dn_index.dn_of(value) if dn_index else None)
+                cls = dn_index.class_of(dn) if dn_index and dn else None
+                if cls is None and dn:
+                    if lazy_classes is None:
+                        lazy_classes = _lazy_classes_(config.raw_configs)
+                    cls = lazy_classes.get(dn)
+                parent_dn = dn.rsplit("/", 1)[0] if dn and "/" in dn else None
+                yield _object_record_(path, cls, dn, parent_dn, value)
+                stack.extend(_child_entries_(path, dn, value))
+                # Records can hold more records (e.g. the EPGs of an application profile),
+                # managed objects only hold their attributes and children
+                items = [
+                    (key, item)
+                    for key, item in (value.items() if isinstance(value, dict) else ())
+                    if key not in ("attributes", "children")
+                ]
+            elif isinstance(value, Mapping):
+                items = list(value.items())
+            elif isinstance(value, (list, tuple)):
+                items = [(None, item) for item in value]
+            else:
+                continue
+
+            stack.extend(
+                (path if key is None else f"{path}.{key}", item)
+                for key, item in reversed(items)
+                if isinstance(item, (Mapping, list, tuple))
+            )
+
+
+def _lazy_classes_(raw_configs: dict) -> dict[str, str]:
+    """Returns {dn: class name} for the objects of the raw configs' TenantCollections"""
+    return {
+        dn: cls
+        for _, cls, dn, _, _ in walk_all_managed_objects(
+            {
+                key: roots
+                for key, roots in raw_configs.items()
+                if isinstance(roots, TenantCollection)
+            }
+        )
+    }
+
+
+def _object_record_(
+    section: str, cls: str | None, dn: str | None, parent_dn: str | None, mo: Any
+) -> dict:
+    return {
+        "section": section,
+        "class": cls,
+        "dn": dn,
+        "parent_dn": parent_dn,
+        "attributes": mo.get("attributes", {}),
+    }
+
+
+def _child_entries_(path: str, dn: str | None, mo: Any) -> list[tuple]:
+    """Stack entries for the children of a managed object found in a section, in reverse order"""
+    return [
+        (path, cls, child_dn if dn else None, dn, child_mo)
+        for cls, child_dn, child_mo in reversed(
+            child_dns(dn or "", mo.get("children", ()))
+        )
+    ]
+
+
+def write_ndjson(
+    records: Iterable[dict], target: str | IO, compress: bool = False
+) -> int:
+    """
+    Writes one compact JSON line per record (see iter_managed_objects and iter_section_objects)
+    and returns the number of lines written. Records are encoded one at a time, so memory use
+    doesn't grow with the size of the backup.
+
+    :param target: Path of the file to write, or an open file object (a text file, or a
+        binary file when compressing)
+    :param compress: Gzip the output (always done for paths ending in .gz)
+    """
+    encoder: json.JSONEncoder = json.JSONEncoder(
+        separators=(",", ":"), default=_json_default_
+    )
+    lines: int = 0
+
+    f: IO = _open_output_(target, compress)
+    try:
+        record: dict
+        for record in records:
+            f.write(encoder.encode(record))
+            f.write("\n")
+            lines += 1
+    finally:
+        if f is not target:
+            f.close()
+
+    return lines
+
+
+def to_sqlite(raw_configs: dict, path: str, batch_size: int = 10000) -> int:
+    """
+    Writes every managed object of the raw configs to a SQLite database (replacing the
+    tables if they exist) and returns the number of managed objects written.
+
+    Tables:
+    - mo (id, class, dn, parent_dn, name)
+    - attribute (mo_id, name, value), one row per attribute of each managed object
+    Indexed on mo class, dn, parent_dn and name, and on attribute mo_id and (name, value).
+
+    The managed objects are streamed into the database in batches of batch_size inside a
+    single transaction, so the export doesn't hold a copy of the backup in memory.
+
+    Example query, all EPGs with preferred group membership enabled:
+    SELECT mo.dn FROM mo JOIN attribute ON attribute.mo_id = mo.id
+    WHERE mo.class = 'fvAEPg' AND attribute.name = 'prefGrMemb' AND attribute.value = 'include'
+    """
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    try:
+        with connection:
+            statement: str
+            for statement in SQLITE_SCHEMA:
+                connection.execute(statement)
+
+            mos: list[tuple[int, str, str, str, str | None]] = []
+            attributes: list[tuple[int, str, str]] = []
+            mo_id: int = 0
+
+            cls: str
+            dn: str
+            parent_dn: str
+            mo: dict
+            for _, cls, dn, parent_dn, mo in walk_all_managed_objects(raw_configs):
+                mo_id += 1
+                mo_attributes: dict = mo.get("attributes", {})
+                mos.append((mo_id, cls, dn, parent_dn, mo_attributes.get("name")))
+                attributes.extend(
+                    (mo_id, key, value) for key, value in mo_attributes.items()
+                )
+
+                if len(mos) >= batch_size:
+                    _insert_(connection, mos, attributes)
+                    mos.clear()
+                    attributes.clear()
+
+            _insert_(connection, mos, attributes)
+
+            for statement in SQLITE_INDEXES:
+                connection.execute(statement)
+    finally:
+        connection.close()
+
+    return mo_id
+
+
+def _insert_(
+    connection: sqlite3.Connection,
+    mos: list[tuple[int, str, str, str, str | None]],
+    attributes: list[tuple[int, str, str]],
+) -> None:
+    connection.executemany("INSERT INTO mo VALUES (?, ?, ?, ?, ?)", mos)
+    connection.executemany("INSERT INTO attribute VALUES (?, ?, ?)", attributes)
+
+
+class _TenantStream(list):
+    """
+    Stands in for a TenantCollection while encoding: an (empty) list that iterates the
+    tenants, decoding them one at a time (see TenantCollection.stream()), so each tenant is
+    encoded and released before the next one is decoded.
+    NOTE: Only the pure Python encoder (JSONEncoder.iterencode) iterates lists through
+    __iter__, the C encoder of json.dumps() would see an empty list.
+    """
+
+    def __init__(self, tenants: TenantCollection) -> None:
+        super().__init__()
+        self._tenants_: TenantCollection = tenants
+
+    def __len__(self) -> int:
+        return len(self._tenants_)
+
+    def __iter__(self) -> Iterator:
+        return (tenant for _, tenant in self._tenants_.stream())
+
+
+def _json_default_(obj: Any) -> Any:
+    """json_default, but encodes lazy tenants one at a time without keeping the decoded copies"""
+    if isinstance(obj, TenantCollection):
+        return _TenantStream(obj)
+
+    return json_default(obj)
+
+
+def write_json(
+    obj: Any,
+    target: str | IO,
+    indent: int | None = 4,
+    compress: bool = False,
+) -> None:
+    """
+    Encodes obj as JSON straight to a file, chunk by chunk (json.JSONEncoder.iterencode),
+    instead of building the whole document in memory first.
+
+    :param target: Path of the file to write, or an open file object (a text file, or a
+        binary file when compressing)
+    :param indent: Indentation of the output, None for compact output
+    :param compress: Gzip the output (always done for paths ending in .gz)
+    """
+    encoder: json.JSONEncoder = json.JSONEncoder(
+        indent=indent,
+        separators=(",", ": ") if indent is not None else (",", ":"),
+        default=_json_default_,
+    )
+
+    if isinstance(obj, TenantCollection):
+        obj = _TenantStream(obj)
+
+    f: IO = _open_output_(target, compress)
+    try:
+        chunk: str
+        # iterencode, not encode: lazy tenants are streamed by the pure Python encoder (see _TenantStream)
+        for chunk in encoder.iterencode(obj):
+            f.write(chunk)
+    finally:
+        if f is not target:
+            f.close()
+
+
+def _open_output_(target: str | IO, compress: bool) -> IO:
+    """Opens a path (or wraps a binary file object) for text output, gzipped if asked or for .gz paths"""
+    if isinstance(target, str):
+        if compress or target.endswith(".gz"):
+            return gzip.open(target, "wt", encoding="utf-8")
+        return open(target, "w", encoding="utf-8")
+    elif compress:
+        return gzip.open(target, "wt", encoding="utf-8")
+
+    return target
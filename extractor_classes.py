@@ -1,6 +1,6 @@
-from typing import Generator, Iterator
+from typing import Iterable, Iterator
 
-from .base import ParentExtractorBase
+from .base import ParentExtractorBase, harvest_keys
 from .fabric_details import (
     FabricInitialization,
     APICCluster,
@@ -34,6 +34,36 @@ from .access_policies import (
     AccessPhyExtDomains,
     AccessPools,
 )
+from .tenant_policies import (
+    TenantVRFs,
+    TenantBridgeDomains,
+    TenantApplicationProfiles,
+    TenantContracts,
+    TenantFilters,
+    TenantL3Outs,
+)
+
+
+# INTERESTING DATA: The following keys in the JSON files are the ones we're searching for
+INTERESTING_KEYS: tuple[str, ...] = (
+    "fabricSetupP",  # TEP Pools
+    "fabricNodeIdentPol",  # hostname, node id, serial number
+    "dhcpClient",  # model, version, node role
+    "mgmtMgmtP",  # mgmt IP addresses
+    "fvTenant",  # All Tenant configuration (EPGs, etc.)
+    "fabricInst",  # BGP Route Reflectors, Pod policy, vPC Policy
+    "infraInfra",  # Switch Profiles, vlan pools, int policies
+    "infraFexP",  # FEX Profiles
+    "vmmProvP",  # VMM Domains
+    "physDomP",  # Physical Domains
+    "l2extDomP",  # L2 Bridged Domains
+    "fcDomP",  # Fibre Channel Domains
+    "l3extDomP",  # L3 Routed Domains
+    "infraAttEntityP",  # AAEPs
+    "infraFuncP",  # Int Policy Grps
+    "aaaUserEp",  # Fabric Security (FIPS Mode)
+    "ctrlrInst",  # APIC Controller Count & Serial #s
+)
 
 
 class ExtractInterestingKeys:
@@ -41,27 +71,15 @@ class ExtractInterestingKeys:
     Search the JSON config "files" for dictionaries with specific
     keys we are looking for and save them to a dictionary.
     These are the root keys where all configuration resides.
+    Each file is walked a single time no matter how many keys are searched for.
     """
 
-    def __init__(self, interesting_files: list[dict]) -> None:
-        # INTERESTING DATA: The following attributes represent keys in the JSON files that we're searching for
-        self.fabricSetupP: list = []  # TEP Pools
-        self.fabricNodeIdentPol: list = []  # hostname, node id, serial number
-        self.dhcpClient: list = []  # model, version, node role
-        self.mgmtMgmtP: list = []  # mgmt IP addresses
-        self.fvTenant: list = []  # All Tenant configuration (EPGs, etc.)
-        self.fabricInst: list = []  # BGP Route Reflectors, Pod policy, vPC Policy
-        self.infraInfra: list = []  # Switch Profiles, vlan pools, int policies
-        self.infraFexP: list = []  # FEX Profiles
-        self.vmmProvP: list = []  # VMM Domains
-        self.physDomP: list = []  # Physical Domains
-        self.l2extDomP: list = []  # L2 Bridged Domains
-        self.fcDomP: list = []  # Fibre Channel Domains
-        self.l3extDomP: list = []  # L3 Routed Domains
-        self.infraAttEntityP: list = []  # AAEPs
-        self.infraFuncP: list = []  # Int Policy Grps
-        self.aaaUserEp: list = []  # Fabric Security (FIPS Mode)
-        self.ctrlrInst: list = []  # APIC Controller Count & Serial #s
+    def __init__(
+        self, interesting_files: list[dict], keys: Iterable[str] | None = None
+    ) -> None:
+        key: str
+        for key in keys or INTERESTING_KEYS:
+            setattr(self, key, [])
 
         self._extract_config_(interesting_files)
 
@@ -75,35 +93,44 @@ class ExtractInterestingKeys:
     def to_dict(self) -> dict:
         return dict(iter(self))
 
-    def _extract_config_(self, interesting_files: list[dict]):
-        def nested_dict_search(key: str, dictionary: dict) -> Generator:
-            """
-            Traverses a nested dictionary searching for a key.
-            When it finds the key, it returns the key's value.
-            """
-
-            for k, v in dictionary.items():
-                if k == key:
-                    yield v
-                elif isinstance(v, dict):
-                    for result in nested_dict_search(key, v):
-                        yield result
-                elif isinstance(v, list):
-                    for d in v:
-                        if isinstance(d, dict):
-                            for result in nested_dict_search(key, d):
-                                yield result
+    @classmethod
+    def from_harvested(
+        cls, harvested: list[dict[str, list]], keys: Iterable[str] | None = None
+    ) -> "ExtractInterestingKeys":
+        """
+        Builds the interesting keys from files that were already harvested
+        (one harvest_keys() result per file, in archive order), e.g. by worker processes.
+        """
+        interesting_keys: ExtractInterestingKeys = cls([], keys)
+        remaining_keys: list = list(interesting_keys.to_dict().keys())
+
+        found: dict[str, list]
+        for found in harvested:
+            interesting_keys._keep_found_(found, remaining_keys)
 
+        return interesting_keys
+
+    def _keep_found_(self, found: dict[str, list], remaining_keys: list) -> None:
+        """Keep the data of the remaining keys found in a file and remove them from the remaining keys"""
         key: str
-        for key in self.to_dict().keys():
-            for file in interesting_files:
-                interesting_data: list = list(nested_dict_search(key, file))
-                if interesting_data:
-                    setattr(self, key, interesting_data)
-                    break
-            else:
-                pass
-                # raise Exception(f"Could not locate key '{key}' in any of the configuration files. Either the Untar operation produced incorrect results or the version of ACI has changed the expected structure.")
+        for key in [key for key in remaining_keys if found.get(key)]:
+            setattr(self, key, found[key])
+            remaining_keys.remove(key)
+
+    def _extract_config_(self, interesting_files: list[dict]):
+        # A key's data is taken from the first file it is found in, so once a key
+        # has been found there's no need to search the remaining files for it
+        remaining_keys: list = list(self.to_dict().keys())
+
+        file: dict
+        for file in interesting_files:
+            if not remaining_keys:
+                break
+
+            self._keep_found_(harvest_keys(file, remaining_keys), remaining_keys)
+
+        # if remaining_keys:
+        #     raise Exception(f"Could not locate key(s) {remaining_keys} in any of the configuration files. Either the Untar operation produced incorrect results or the version of ACI has changed the expected structure.")
 
 
 class ExtractFabricDetails(ParentExtractorBase):
@@ -111,12 +138,21 @@ class ExtractFabricDetails(ParentExtractorBase):
     Class for extracting fabric details from raw aci config files.
     """
 
-    def __init__(self, raw_configs: dict) -> None:
-        super().__init__(raw_configs)
-        self.fabric_initialization: dict = FabricInitialization(self.raw_configs).config
-        self.apic_cluster: dict = APICCluster(self.raw_configs).config
-        self.fabric_inventory: dict = FabricInventory(self.raw_configs).config
-        self.tep_pools: dict = FabricTEPPools(self.raw_configs).config
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        super().__init__(raw_configs, previous, changed_keys)
+        self.fabric_initialization: dict = self._child_config_(
+            "fabric_initialization", FabricInitialization
+        )
+        self.apic_cluster: dict = self._child_config_("apic_cluster", APICCluster)
+        self.fabric_inventory: dict = self._child_config_(
+            "fabric_inventory", FabricInventory
+        )
+        self.tep_pools: dict = self._child_config_("tep_pools", FabricTEPPools)
 
     def __str__(self) -> str:
         return "ExtractFabricDetails"
@@ -127,14 +163,23 @@ class ExtractSystemSettings(ParentExtractorBase):
     Class for extracting System Settings from raw aci config files.
     """
 
-    def __init__(self, raw_configs: dict) -> None:
-        super().__init__(raw_configs)
-        self.bgp: dict = BGPConfig(self.raw_configs).config
-        self.endpoint_controls: dict = EndpointControls(self.raw_configs).config
-        self.fabric_wide_settings: dict = FabricWideSettings(self.raw_configs).config
-        self.isis_policy: dict = ISISPolicy(self.raw_configs).config
-        self.port_tracking: dict = PortTracking(self.raw_configs).config
-        self.misc: dict = MiscConfig(self.raw_configs).config
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        super().__init__(raw_configs, previous, changed_keys)
+        self.bgp: dict = self._child_config_("bgp", BGPConfig)
+        self.endpoint_controls: dict = self._child_config_(
+            "endpoint_controls", EndpointControls
+        )
+        self.fabric_wide_settings: dict = self._child_config_(
+            "fabric_wide_settings", FabricWideSettings
+        )
+        self.isis_policy: dict = self._child_config_("isis_policy", ISISPolicy)
+        self.port_tracking: dict = self._child_config_("port_tracking", PortTracking)
+        self.misc: dict = self._child_config_("misc", MiscConfig)
 
     def __str__(self):
         return "ExtractFabricDetails"
@@ -145,16 +190,31 @@ class ExtractFabricPolicies(ParentExtractorBase):
     Class for extracting Fabric Policies from raw aci config files.
     """
 
-    def __init__(self, raw_configs: dict) -> None:
-        super().__init__(raw_configs)
-        self.policies_pod: dict = PoliciesPOD(self.raw_configs).config
-        self.policies_interface: dict = PoliciesInterface(self.raw_configs).config
-        self.policies_global: dict = PoliciesGlobal(self.raw_configs).config
-        self.policies_monitoring: dict = PoliciesMonitoring(self.raw_configs).config
-        self.policies_macsec: dict = PoliciesMACSec(self.raw_configs).config
-        self.pods_policy_groups: dict = PodsPolicyGroup(self.raw_configs).config
-        self.pods_profiles: dict = PodsProfiles(self.raw_configs).config
-        self.interfaces: dict = FabricInterfaces(self.raw_configs).config
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        super().__init__(raw_configs, previous, changed_keys)
+        self.policies_pod: dict = self._child_config_("policies_pod", PoliciesPOD)
+        self.policies_interface: dict = self._child_config_(
+            "policies_interface", PoliciesInterface
+        )
+        self.policies_global: dict = self._child_config_(
+            "policies_global", PoliciesGlobal
+        )
+        self.policies_monitoring: dict = self._child_config_(
+            "policies_monitoring", PoliciesMonitoring
+        )
+        self.policies_macsec: dict = self._child_config_(
+            "policies_macsec", PoliciesMACSec
+        )
+        self.pods_policy_groups: dict = self._child_config_(
+            "pods_policy_groups", PodsPolicyGroup
+        )
+        self.pods_profiles: dict = self._child_config_("pods_profiles", PodsProfiles)
+        self.interfaces: dict = self._child_config_("interfaces", FabricInterfaces)
 
     def __str__(self):
         return "ExtractFabricDetails"
@@ -165,15 +225,178 @@ class ExtractAccessPolicies(ParentExtractorBase):
     Class for extracting Access Policies from raw aci config files.
     """
 
-    def __init__(self, raw_configs: dict) -> None:
-        super().__init__(raw_configs)
-        self.policies_interface: dict = AccessPoliciesInterface(self.raw_configs).config
-        self.policies_global: dict = AccessPoliciesGlobal(self.raw_configs).config
-        self.policies_switch: dict = AccessPoliciesSwitch(self.raw_configs).config
-        self.interfaces: dict = AccessInterfaces(self.raw_configs).config
-        self.switches: dict = AccessSwitches(self.raw_configs).config
-        self.phys_ext_domains: dict = AccessPhyExtDomains(self.raw_configs).config
-        self.pools: dict = AccessPools(self.raw_configs).config
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        super().__init__(raw_configs, previous, changed_keys)
+        self.policies_interface: dict = self._child_config_(
+            "policies_interface", AccessPoliciesInterface
+        )
+        self.policies_global: dict = self._child_config_(
+            "policies_global", AccessPoliciesGlobal
+        )
+        self.policies_switch: dict = self._child_config_(
+            "policies_switch", AccessPoliciesSwitch
+        )
+        self.interfaces: dict = self._child_config_("interfaces", AccessInterfaces)
+        self.switches: dict = self._child_config_("switches", AccessSwitches)
+        self.phys_ext_domains: dict = self._child_config_(
+            "phys_ext_domains", AccessPhyExtDomains
+        )
+        self.pools: dict = self._child_config_("pools", AccessPools)
 
     def __str__(self):
         return "ExtractFabricDetails"
+
+
+class ExtractTenantPolicies(ParentExtractorBase):
+    """
+    Class for extracting the tenant objects (VRFs, BDs, EPGs, contracts, filters, L3Outs)
+    from raw aci config files, keyed by tenant name then object name.
+    Relations by name (BD -> VRF, EPG -> BD, EPG -> contracts, ...) are resolved to DNs in a
+    single pass once everything is extracted, looking in the object's own tenant then in
+    common like the APIC does. Unresolved relations are None. The reverse links (the BDs of
+    a VRF, the EPGs of a BD, the providers and consumers of a contract...) are filled in by
+    the same pass.
+    """
+
+    def __init__(
+        self,
+        raw_configs: dict,
+        previous: dict | None = None,
+        changed_keys: Iterable[str] | None = None,
+    ) -> None:
+        super().__init__(raw_configs, previous, changed_keys)
+        self.vrfs: dict = self._child_config_("vrfs", TenantVRFs)
+        self.bridge_domains: dict = self._child_config_(
+            "bridge_domains", TenantBridgeDomains
+        )
+        self.application_profiles: dict = self._child_config_(
+            "application_profiles", TenantApplicationProfiles
+        )
+        self.contracts: dict = self._child_config_("contracts", TenantContracts)
+        self.filters: dict = self._child_config_("filters", TenantFilters)
+        self.l3outs: dict = self._child_config_("l3outs", TenantL3Outs)
+
+        self._link_()
+
+    def __str__(self):
+        return "ExtractTenantPolicies"
+
+    def _resolve_(self, objects: dict, tenant: str, name: str | None) -> dict | None:
+        """Returns the named object of the tenant (or of tenant common), or None"""
+        if name is None:
+            return None
+
+        # An empty name resolves to the default object
+        name = name or "default"
+        return objects.get(tenant, {}).get(name) or objects.get("common", {}).get(name)
+
+    def _link_contracts_(self, tenant: str, record: dict, consumer_dn: str) -> None:
+        direction: str
+        for direction in ("provided", "consumed"):
+            record[direction] = []
+            for name in record[f"{direction}_names"]:
+                contract: dict | None = self._resolve_(self.contracts, tenant, name)
+                record[direction].append(contract["dn"] if contract else None)
+                if contract:
+                    role: str = "providers" if direction == "provided" else "consumers"
+                    contract[role].append(consumer_dn)
+
+    def _copy_reused_(self, attribute: str, nested: str | None = None) -> None:
+        """
+        Replace the records of an attribute reused from the previous output with copies (along
+        with the records under record[nested]), so _link_() doesn't modify the previous output
+        """
+        objects: dict = getattr(self, attribute)
+        if not self._previous_ or objects is not self._previous_.get(attribute):
+            return
+
+        copies: dict = {}
+        tenant: str
+        records: dict
+        for tenant, records in objects.items():
+            copies[tenant] = {}
+            for name, record in records.items():
+                copies[tenant][name] = dict(record)
+                if nested:
+                    copies[tenant][name][nested] = {
+                        key: dict(value) for key, value in record[nested].items()
+                    }
+
+        setattr(self, attribute, copies)
+
+    def _link_(self) -> None:
+        """Resolve the relations by name to DNs and fill in the reverse links"""
+        attribute: str
+        nested: str | None
+        for attribute, nested in (
+            ("vrfs", None),
+            ("bridge_domains", None),
+            ("application_profiles", "epgs"),
+            ("contracts", "subjects"),
+            ("l3outs", "external_epgs"),
+        ):
+            self._copy_reused_(attribute, nested)
+
+        record: dict
+        for vrfs in self.vrfs.values():
+            for record in vrfs.values():
+                record["bridge_domains"] = []
+                record["l3outs"] = []
+        for contracts in self.contracts.values():
+            for record in contracts.values():
+                record["providers"] = []
+                record["consumers"] = []
+        for bds in self.bridge_domains.values():
+            for record in bds.values():
+                record["epgs"] = []
+
+        tenant: str
+        for tenant, contracts in self.contracts.items():
+            for record in contracts.values():
+                for subject in record["subjects"].values():
+                    subject["filters"] = [
+                        flt["dn"] if flt else None
+                        for flt in (
+                            self._resolve_(self.filters, tenant, name)
+                            for name in subject["filter_names"]
+                        )
+                    ]
+
+        for tenant, l3outs in self.l3outs.items():
+            for record in l3outs.values():
+                vrf: dict | None = self._resolve_(self.vrfs, tenant, record["vrf_name"])
+                record["vrf"] = vrf["dn"] if vrf else None
+                if vrf:
+                    vrf["l3outs"].append(record["dn"])
+                for external_epg in record["external_epgs"].values():
+                    self._link_contracts_(tenant, external_epg, external_epg["dn"])
+
+        for tenant, bds in self.bridge_domains.items():
+            for record in bds.values():
+                vrf = self._resolve_(self.vrfs, tenant, record["vrf_name"])
+                record["vrf"] = vrf["dn"] if vrf else None
+                if vrf:
+                    vrf["bridge_domains"].append(record["dn"])
+                record["l3outs"] = [
+                    l3out["dn"] if l3out else None
+                    for l3out in (
+                        self._resolve_(self.l3outs, tenant, name)
+                        for name in record["l3out_names"]
+                    )
+                ]
+
+        for tenant, aps in self.application_profiles.items():
+            for ap in aps.values():
+                for record in ap["epgs"].values():
+                    bd: dict | None = self._resolve_(
+                        self.bridge_domains, tenant, record["bd_name"]
+                    )
+                    record["bridge_domain"] = bd["dn"] if bd else None
+                    if bd:
+                        bd["epgs"].append(record["dn"])
+                    self._link_contracts_(tenant, record, record["dn"])
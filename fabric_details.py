@@ -1,13 +1,11 @@
-# Built-In Imports
-import json
-
 # Custom Imports
 from .base import ChildExtractorBase, dict_extractor
+from .decoders import loads
 
 
 def safe_json_load(s: str) -> dict:
     """
-    A wrapper for json.loads() to return an empty dictionary if json.loads()
+    A wrapper for decoders.loads() to return an empty dictionary if the decoder
     raises an exception (invalid input)
 
     :param s: Input string to attempt the conversion to json
@@ -16,12 +14,15 @@ def safe_json_load(s: str) -> dict:
     :rtype: dict
     """
     try:
-        return json.loads(s)
-    except json.JSONDecodeError:
+        return loads(s)
+    except ValueError:
+        # json.JSONDecodeError (and the other decoder backends' errors) are ValueErrors
         return {}
 
 
 class FabricInitialization(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("ctrlrInst",)
+
     def _extract_config_(self) -> None:
         if len(self.raw_configs["ctrlrInst"]) > 1:
             print(
@@ -30,10 +31,11 @@ class FabricInitialization(ChildExtractorBase):
 
         # Extract cluster information from the raw configs
         cluster_data: list = [
-            each["tagAnnotation"]["attributes"]["value"]
-            for each in self.raw_configs["ctrlrInst"][0]["children"]
-            if "tagAnnotation" in each
-            and each["tagAnnotation"]["attributes"]["key"] == "bootx.cluster"
+            each["attributes"]["value"]
+            for each in self._children_(
+                self.raw_configs["ctrlrInst"][0], "tagAnnotation"
+            )
+            if each["attributes"]["key"] == "bootx.cluster"
         ]
         if len(cluster_data) > 1:
             print(
@@ -41,7 +43,7 @@ class FabricInitialization(ChildExtractorBase):
             )
 
         if cluster_data:
-            cluster_data = json.loads(cluster_data[0])
+            cluster_data = loads(cluster_data[0])
 
             # Populate the model with extracted data
             self.config["fabric_name"] = cluster_data["cluster"]["fabricName"]
@@ -54,24 +56,29 @@ class FabricInitialization(ChildExtractorBase):
 
 
 class APICCluster(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("ctrlrInst",)
+
     def _extract_config_(self) -> None:
         # Extract APIC serial numbers from the raw configs (ctrlrInst > fabricNodeIdentPol > children > fabricCtrlrIdentP)
         controller_serials: list = [
-            another["fabricCtrlrIdentP"]["attributes"]["serial"]
-            for each in self.raw_configs["ctrlrInst"][0]["children"]
-            if "fabricNodeIdentPol" in each
-            for another in each["fabricNodeIdentPol"]["children"]
-            if "fabricCtrlrIdentP" in another
+            another["attributes"]["serial"]
+            for each in self._children_(
+                self.raw_configs["ctrlrInst"][0], "fabricNodeIdentPol"
+            )
+            for another in self._children_(each, "fabricCtrlrIdentP")
         ]
 
         # Get the APIC data for those serial numbers (ctrlInst > children > tagAnnotation)
+        annotations: list = self._children_(
+            self.raw_configs["ctrlrInst"][0], "tagAnnotation"
+        )
         controller_data: list = sorted(
             [
-                item["tagAnnotation"]["attributes"]
-                for item in self.raw_configs["ctrlrInst"][0]["children"]
-                if safe_json_load(
-                    item.get("tagAnnotation", {}).get("attributes", {}).get("value", "")
-                ).get("serialNumber", "")
+                item["attributes"]
+                for item in annotations
+                if safe_json_load(item.get("attributes", {}).get("value", "")).get(
+                    "serialNumber", ""
+                )
                 in controller_serials
             ],
             key=lambda d: safe_json_load(d["value"])["nodeId"],
@@ -82,11 +89,9 @@ class APICCluster(ChildExtractorBase):
             attributes = safe_json_load(controller["value"])
             cimc_ip: str = safe_json_load(
                 [
-                    item["tagAnnotation"]["attributes"]
-                    for item in self.raw_configs["ctrlrInst"][0]["children"]
-                    if item.get("tagAnnotation", {})
-                    .get("attributes", {})
-                    .get("key", "")
+                    item["attributes"]
+                    for item in annotations
+                    if item.get("attributes", {}).get("key", "")
                     == f"{controller['key']}.cimc"
                 ][0]["value"]
             )["address4"]
@@ -101,6 +106,8 @@ class APICCluster(ChildExtractorBase):
 
 
 class FabricInventory(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricNodeIdentPol", "dhcpClient", "mgmtMgmtP")
+
     def _extract_config_(self) -> None:
         """
         The inventory data is spread across three different json structures (trees):
@@ -126,11 +133,9 @@ class FabricInventory(ChildExtractorBase):
         try:
             fabric_nodes = sorted(
                 [
-                    v
+                    node
                     for each in self.raw_configs["fabricNodeIdentPol"]
-                    for node in each["children"]
-                    for k, v in node.items()
-                    if k == "fabricNodeIdentP"
+                    for node in self._children_(each, "fabricNodeIdentP")
                 ],
                 key=lambda d: d["attributes"]["nodeId"],
             )
@@ -182,27 +187,27 @@ class FabricInventory(ChildExtractorBase):
 
         # SEARCH THE 3RD TREE (mgmtMgmtP) FOR OOB MGMT IP ADDRESS AND POD ID
         fabric_nodes = [
-            node["mgmtRsOoBStNode"]["attributes"]
+            node["attributes"]
             for each in self.raw_configs["mgmtMgmtP"]
-            for child in each["children"]
-            for k, v in child.items()
-            if k == "mgmtOoB"
-            for node in v["children"]
-            if "mgmtRsOoBStNode" in node
+            for child in self._children_(each, "mgmtOoB")
+            for node in self._children_(child, "mgmtRsOoBStNode")
         ]
-        # We don't have the node name in mgmtMgmtP so we need to loop through both records and cross-reference using the node ID.
+        # We don't have the node name in mgmtMgmtP so we need to cross-reference using the node ID.
+        # Key the OOB records by the node ID from their tDn (topology/pod-X/node-Y) so each lookup is O(1)
+        oob_nodes: dict = {
+            oob_node["tDn"].split("/")[-1].lstrip("node-"): oob_node
+            for oob_node in fabric_nodes
+        }
         for node in self.config:
-            for oob_node in fabric_nodes:
-                if self.config[node]["id"] == oob_node["tDn"].split("/")[-1].lstrip(
-                    "node-"
-                ):
-                    self.config[node]["ip"] = oob_node["addr"]
-                    self.config[node]["pod"] = (
-                        oob_node["tDn"].split("/")[1].lstrip("pod-")
-                    )
+            if self.config[node]["id"] in oob_nodes:
+                oob_node = oob_nodes[self.config[node]["id"]]
+                self.config[node]["ip"] = oob_node["addr"]
+                self.config[node]["pod"] = oob_node["tDn"].split("/")[1].lstrip("pod-")
 
 
 class FabricTEPPools(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricSetupP",)
+
     def _extract_config_(self) -> None:
         # PHYSICAL TEP POOLS
         try:
@@ -2,6 +2,8 @@ from .base import ChildExtractorBase, dict_extractor
 
 
 class PoliciesPOD(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # DATE AND TIME POD POLICIES
         self.config["date_time"] = dict_extractor(
@@ -13,6 +15,8 @@ class PoliciesPOD(ChildExtractorBase):
 
 
 class PoliciesInterface(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # L3 INTERFACE INTERFACE POLICIES
         self.config["l3_interface"] = dict_extractor(
@@ -46,6 +50,8 @@ class PoliciesInterface(ChildExtractorBase):
 
 
 class PoliciesGlobal(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # DNS PROFILES
         self.config["dns_profile"] = dict_extractor(
@@ -59,6 +65,8 @@ class PoliciesGlobal(ChildExtractorBase):
 
 
 class PoliciesMonitoring(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # FABRIC NODE CONTROLS POLICIES
         self.config["fabric_node_control"] = dict_extractor(
@@ -67,6 +75,8 @@ class PoliciesMonitoring(ChildExtractorBase):
 
 
 class PoliciesMACSec(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # MACSEC INTERFACE POLICIES
         self.config["interface"] = dict_extractor(
@@ -85,6 +95,8 @@ class PoliciesMACSec(ChildExtractorBase):
 
 
 class PodsPolicyGroup(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # POD POLICY GROUPS
         self.config["groups"] = dict_extractor(
@@ -93,6 +105,8 @@ class PodsPolicyGroup(ChildExtractorBase):
 
 
 class PodsProfiles(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # POD PROFILES
         self.config["profile"] = dict_extractor(
@@ -101,6 +115,8 @@ class PodsProfiles(ChildExtractorBase):
 
 
 class FabricInterfaces(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # SPINE POLICY GROUPS
         self.config["spine_policy_group"] = dict_extractor(
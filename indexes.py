@@ -0,0 +1,376 @@
+import hashlib
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+
+
+class ChildrenIndex:
+    """
+    Maps managed objects to their children grouped by class name, so finding the children
+    of a given class is a dictionary lookup instead of a scan of the whole 'children' list.
+    A managed object is indexed the first time its children are looked up (or up front with
+    build()/add_tree()), so only the parts of the backup the extractors visit are indexed.
+
+    Managed objects are the {"attributes": {...}, "children": [...]} dictionaries
+    (the values under the class name keys). They are indexed by identity.
+    """
+
+    def __init__(self, raw_configs: dict | None = None) -> None:
+        # id(managed object) -> (managed object, {class name: [child managed objects]})
+        self._index_: dict[int, tuple[dict, dict[str, list]]] = {}
+
+        if raw_configs:
+            self.build(raw_configs)
+
+    def __len__(self) -> int:
+        return len(self._index_)
+
+    def build(self, raw_configs: dict) -> None:
+        """Index every managed object found under the root keys of the raw configs"""
+        root: list
+        for root in raw_configs.values():
+            if isinstance(root, list):
+                self.add_tree(root)
+
+    def add_tree(self, mos: list) -> None:
+        """Index a list of managed objects and all of their descendants"""
+        # Compact ManagedObjects (compact=True) are Mappings, not dicts
+        stack: list = [mo for mo in mos if isinstance(mo, Mapping)]
+        while stack:
+            mo: dict = stack.pop()
+            if id(mo) in self._index_ or "children" not in mo:
+                # Already indexed (root keys can be nested in each other) or a leaf object
+                continue
+
+            groups: dict[str, list] = self.add(mo)
+            for children in groups.values():
+                stack.extend(children)
+
+    def add(self, mo: dict) -> dict[str, list]:
+        """Index the children of a single managed object"""
+        groups: dict[str, list] = {}
+
+        child: dict
+        for child in mo["children"]:
+            for cls, child_mo in child.items():
+                if cls in groups:
+                    groups[cls].append(child_mo)
+                else:
+                    groups[cls] = [child_mo]
+
+        self._index_[id(mo)] = (mo, groups)
+
+        return groups
+
+    def children(self, mo: dict, cls: str) -> list:
+        """
+        Returns the children of the managed object that are of the given class.
+        Like scanning mo["children"], this raises a KeyError if the object has no children.
+        """
+        entry: tuple | None = self._index_.get(id(mo))
+        if entry is None or entry[0] is not mo:
+            # First lookup of this object's children, group them all in one scan
+            return self.add(mo).get(cls, [])
+
+        return entry[1].get(cls, [])
+
+
+# Relative name (RN) formats of the managed object classes found in ACI backups.
+# The fields are filled in from the object's attributes.
+RN_FORMATS: dict[str, str] = {
+    # Roots
+    "polUni": "uni",
+    "infraInfra": "infra",
+    "fabricInst": "fabric",
+    "ctrlrInst": "controller",
+    "aaaUserEp": "userext",
+    "aaaFabricSec": "fabricsec",
+    "vmmProvP": "vmmp-{vendor}",
+    "vmmDomP": "dom-{name}",
+    "tagAnnotation": "annotationKey-[{key}]",
+    # Controller
+    "fabricNodeIdentPol": "nodeidentpol",
+    "fabricNodeIdentP": "nodep-{serial}",
+    "fabricSetupPol": "setuppol",
+    "fabricSetupP": "setupp-{podId}",
+    # Domains
+    "physDomP": "phys-{name}",
+    "l2extDomP": "l2dom-{name}",
+    "l3extDomP": "l3dom-{name}",
+    "fcDomP": "fc-{name}",
+    "infraRsVlanNs": "rsvlanNs",
+    "infraRsVsanNs": "rsvsanNs",
+    "infraRsVipAddrNs": "rsvipAddrNs",
+    # Access policies
+    "infraAttEntityP": "attentp-{name}",
+    "infraRsDomP": "rsdomP-[{tDn}]",
+    "infraFuncP": "funcprof",
+    "infraAccPortGrp": "accportgrp-{name}",
+    "infraAccBndlGrp": "accbundle-{name}",
+    "infraAccNodePGrp": "accnodepgrp-{name}",
+    "infraSpAccPortGrp": "spaccportgrp-{name}",
+    "infraSpineAccNodePGrp": "spaccnodepgrp-{name}",
+    "infraRsAttEntP": "rsattEntP",
+    "infraNodeP": "nprof-{name}",
+    "infraLeafS": "leaves-{name}-typ-{type}",
+    "infraNodeBlk": "nodeblk-{name}",
+    "infraRsAccPortP": "rsaccPortP-[{tDn}]",
+    "infraAccPortP": "accportprof-{name}",
+    "infraHPortS": "hports-{name}-typ-{type}",
+    "infraPortBlk": "portblk-{name}",
+    "infraSubPortBlk": "subportblk-{name}",
+    "infraRsAccBaseGrp": "rsaccBaseGrp",
+    "infraFexP": "fexprof-{name}",
+    "infraFexBndlGrp": "fexbundle-{name}",
+    "infraSpineP": "spprof-{name}",
+    "infraSpineS": "spines-{name}-typ-{type}",
+    "infraRsSpAccPortP": "rsspAccPortP-[{tDn}]",
+    "infraSpAccPortP": "spaccportprof-{name}",
+    "infraSHPortS": "shports-{name}-typ-{type}",
+    "infraRsSpAccGrp": "rsspAccGrp",
+    # Pools
+    "fvnsVlanInstP": "vlanns-[{name}]-{allocMode}",
+    "fvnsVxlanInstP": "vxlanns-{name}",
+    "fvnsVsanInstP": "vsanns-[{name}]-{allocMode}",
+    "fvnsEncapBlk": "from-[{from}]-to-[{to}]",
+    "fvnsVsanEncapBlk": "vsanfrom-[{from}]-to-[{to}]",
+    # Tenants
+    "fvTenant": "tn-{name}",
+    "fvCtx": "ctx-{name}",
+    "fvBD": "BD-{name}",
+    "fvSubnet": "subnet-[{ip}]",
+    "fvRsCtx": "rsctx",
+    "fvAp": "ap-{name}",
+    "fvAEPg": "epg-{name}",
+    "fvRsBd": "rsbd",
+    "fvRsProv": "rsprov-{tnVzBrCPName}",
+    "fvRsCons": "rscons-{tnVzBrCPName}",
+    "fvRsDomAtt": "rsdomAtt-[{tDn}]",
+    "fvRsPathAtt": "rspathAtt-[{tDn}]",
+    "vzBrCP": "brc-{name}",
+    "vzSubj": "subj-{name}",
+    "vzRsSubjFiltAtt": "rssubjFiltAtt-{tnVzFilterName}",
+    "vzFilter": "flt-{name}",
+    "vzEntry": "e-{name}",
+    "l3extOut": "out-{name}",
+    "l3extRsEctx": "rsectx",
+    "l3extRsL3DomAtt": "rsl3DomAtt",
+    "l3extLNodeP": "lnodep-{name}",
+    "l3extLIfP": "lifp-{name}",
+    "l3extInstP": "instP-{name}",
+    "l3extSubnet": "extsubnet-[{ip}]",
+    "mgmtMgmtP": "mgmtp-{name}",
+    "mgmtOoB": "oob-{name}",
+    "mgmtRsOoBStNode": "rsooBStNode-[{tDn}]",
+    # Fabric policies
+    "bgpInstPol": "bgpInstP-{name}",
+    "bgpAsP": "as",
+    "bgpRRP": "rr",
+    "bgpRRNodePEp": "node-{id}",
+    "isisDomPol": "isisDomP-{name}",
+    "fabricFuncP": "funcprof",
+    "fabricPodP": "podprof-{name}",
+    "fabricPodPGrp": "podpgrp-{name}",
+    "fabricProtPol": "protpol",
+    "fabricExplicitGEp": "expgep-{name}",
+    "fabricNodePEp": "nodepep-{id}",
+}
+
+# Parent DNs of the root keys harvested by ExtractInterestingKeys,
+# used when the root object doesn't carry its own 'dn' attribute.
+ROOT_PARENT_DNS: dict[str, str] = {
+    "fvTenant": "uni",
+    "infraInfra": "uni",
+    "fabricInst": "uni",
+    "ctrlrInst": "uni",
+    "aaaUserEp": "uni",
+    "vmmProvP": "uni",
+    "physDomP": "uni",
+    "l2extDomP": "uni",
+    "fcDomP": "uni",
+    "l3extDomP": "uni",
+    "infraFexP": "uni/infra",
+    "infraAttEntityP": "uni/infra",
+    "infraFuncP": "uni/infra",
+    "fabricNodeIdentPol": "uni/controller",
+    "fabricSetupP": "uni/controller/setuppol",
+    "mgmtMgmtP": "uni/tn-mgmt",
+}
+
+
+def make_rn(cls: str, attributes: dict) -> str:
+    """
+    Returns the relative name of a managed object.
+    Uses the object's 'rn' attribute if it has one, then the RN_FORMATS table.
+    Classes that aren't in the table get a "<class>-<name>" (or "<class>") placeholder RN,
+    which is not the name the APIC would use and isn't always unique among siblings
+    (child_dns makes the DNs unique).
+    """
+    if "rn" in attributes:
+        return attributes["rn"]
+
+    if cls in RN_FORMATS:
+        try:
+            return RN_FORMATS[cls].format_map(attributes)
+        except KeyError:
+            pass
+
+    name: str = attributes.get("name", "")
+
+    return f"{cls}-{name}" if name else cls
+
+
+def child_dns(parent_dn: str, children: Iterable[dict]) -> list[tuple[str, str, dict]]:
+    """
+    Returns (class name, dn, managed object) for the children of a managed object
+    ({class: managed object} dictionaries), in document order.
+    A child's 'dn' attribute is used when it has one, otherwise the DN is built from the
+    parent DN and the RN (see make_rn). A DN that clashes with an earlier sibling's
+    (e.g. placeholder RNs, or several fabricCtrlrIdentP) gets its ordinal among the siblings
+    sharing that DN appended: "<dn>-2", "<dn>-3"... so siblings are told apart by
+    (DN, position) instead of shadowing each other.
+    """
+    entries: list[tuple[str, str, dict]] = []
+    dns: set[str] = set()
+
+    child: dict
+    for child in children:
+        cls: str
+        mo: dict
+        for cls, mo in child.items():
+            attributes: dict = mo.get("attributes", {})
+            dn: str = attributes.get("dn", "")
+            if not dn:
+                rn: str = make_rn(cls, attributes)
+                dn = f"{parent_dn}/{rn}" if parent_dn else rn
+            ordinal: int = 1
+            unique_dn: str = dn
+            while unique_dn in dns:
+                ordinal += 1
+                unique_dn = f"{dn}-{ordinal}"
+            dn = unique_dn
+            dns.add(dn)
+            entries.append((cls, dn, mo))
+
+    return entries
+
+
+def walk_managed_objects(raw_configs: dict) -> Iterator[tuple[str, str, str, dict]]:
+    """
+    Walks every managed object in the raw configs, parents before children and in
+    document order, yielding (class name, dn, parent dn, managed object) for each.
+
+    DNs are worked out by child_dns (the object's 'dn' attribute, or the parent DN and the
+    RN, unique among siblings).
+    Root keys are walked from the shallowest to the deepest so objects that were
+    harvested more than once (e.g. infraFuncP inside infraInfra) are only visited once,
+    under their full DN.
+    """
+    seen: set[int] = set()
+
+    root_key: str
+    for root_key in sorted(
+        raw_configs, key=lambda key: ROOT_PARENT_DNS.get(key, "").count("/")
+    ):
+        roots: list = raw_configs[root_key]
+        if not isinstance(roots, list):
+            continue
+
+        parent_dn: str = ROOT_PARENT_DNS.get(root_key, "")
+        # (class name, dn, parent dn, managed object), compact ManagedObjects are Mappings
+        stack: list[tuple[str, str, str, dict]] = [
+            (cls, dn, parent_dn, mo)
+            for cls, dn, mo in reversed(
+                child_dns(
+                    parent_dn,
+                    [{root_key: mo} for mo in roots if isinstance(mo, Mapping)],
+                )
+            )
+        ]
+        while stack:
+            cls, dn, parent_dn, mo = stack.pop()
+            if id(mo) in seen:
+                continue
+            seen.add(id(mo))
+
+            yield cls, dn, parent_dn, mo
+
+            stack.extend(
+                (child_cls, child_dn, dn, child_mo)
+                for child_cls, child_dn, child_mo in reversed(
+                    child_dns(dn, mo.get("children", []))
+                )
+            )
+
+
+def hash_subtrees(raw_configs: dict) -> dict[str, bytes]:
+    """
+    Computes a content hash (Merkle hash) of the subtree under every managed object in the
+    raw configs, keyed by DN. An object's hash covers its class, its attributes and the
+    hashes of its children (in any order), so two subtrees with the same hash hold the same
+    configuration and can be skipped when comparing backups.
+    The hashes are computed bottom-up in one walk (walk_managed_objects yields parents
+    before their descendants, so it is processed in reverse).
+    """
+    mos: list[tuple[str, str, str, dict]] = list(walk_managed_objects(raw_configs))
+    hashes: dict[str, bytes] = {}
+    # dn -> hashes of the children processed so far
+    child_hashes: dict[str, list[bytes]] = {}
+
+    cls: str
+    dn: str
+    parent_dn: str
+    mo: dict
+    for cls, dn, parent_dn, mo in reversed(mos):
+        digest = hashlib.blake2b(cls.encode(), digest_size=16)
+        for key, value in sorted(mo.get("attributes", {}).items()):
+            digest.update(f"\0{key}\1{value}".encode())
+        for child_hash in sorted(child_hashes.pop(dn, ())):
+            digest.update(child_hash)
+
+        hashes[dn] = digest.digest()
+        child_hashes.setdefault(parent_dn, []).append(hashes[dn])
+
+    return hashes
+
+
+class DNIndex:
+    """
+    Maps the distinguished name (DN) of every managed object in the raw configs
+    to the managed object, and each managed object (by identity) back to its DN.
+    """
+
+    def __init__(self) -> None:
+        self._mos_: dict[str, tuple[str, dict]] = {}
+        self._dns_: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._mos_)
+
+    def __contains__(self, dn: str) -> bool:
+        return dn in self._mos_
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._mos_)
+
+    def add(self, cls: str, dn: str, mo: dict) -> None:
+        if dn not in self._mos_:
+            self._mos_[dn] = (cls, mo)
+            self._dns_[id(mo)] = dn
+
+    def get(self, dn: str) -> dict | None:
+        """Returns the managed object with the given DN (or None)"""
+        entry: tuple[str, dict] | None = self._mos_.get(dn)
+        return entry[1] if entry else None
+
+    def class_of(self, dn: str) -> str | None:
+        """Returns the class name of the managed object with the given DN (or None)"""
+        entry: tuple[str, dict] | None = self._mos_.get(dn)
+        return entry[0] if entry else None
+
+    def dn_of(self, mo: dict) -> str | None:
+        """Returns the DN of a managed object (or None if it isn't indexed)"""
+        dn: str | None = self._dns_.get(id(mo))
+        if dn is None or self._mos_[dn][1] is not mo:
+            return None
+
+        return dn
@@ -0,0 +1,91 @@
+import sys
+
+
+class StringInterner:
+    """
+    Deduplicates the strings of decoded config files so every occurrence of an equal
+    string shares one object.
+    Every MO repeats the same attribute names (name, dn, descr, annotation, status...)
+    and many of the same values ("", "enabled", "no", "uni/..." relation targets...), which
+    the decoders otherwise create as separate string objects.
+
+    Keys are interned with sys.intern. Values are deduplicated through a table that only
+    lives as long as the interner, and only values up to max_value_length characters are
+    considered (long values like descriptions and JSON annotations are rarely repeated).
+    The number of bytes freed by dropping duplicate strings is tracked in stats.
+    """
+
+    def __init__(self, max_value_length: int = 128) -> None:
+        self.max_value_length: int = max_value_length
+        self._values_: dict[str, str] = {}
+        # ids of the duplicate strings already counted in the stats. The decoders share key
+        # objects within a file, so a duplicate only frees memory the first time it's replaced
+        self._dropped_: set[int] = set()
+        self.stats: dict[str, int] = {"strings": 0, "duplicates": 0, "bytes_saved": 0}
+
+    def __str__(self) -> str:
+        return f"{self.stats['bytes_saved'] / 1024**2:.1f} MB saved by interning {self.stats['duplicates']} of {self.stats['strings']} strings"
+
+    def _count_(self, original: str, interned: str) -> str:
+        self.stats["strings"] += 1
+        if interned is not original and id(original) not in self._dropped_:
+            self._dropped_.add(id(original))
+            self.stats["duplicates"] += 1
+            self.stats["bytes_saved"] += sys.getsizeof(original)
+
+        return interned
+
+    def key(self, key: str) -> str:
+        return self._count_(key, sys.intern(key))
+
+    def value(self, value: str) -> str:
+        if len(value) > self.max_value_length:
+            return value
+
+        return self._count_(value, self._values_.setdefault(value, value))
+
+    def intern_tree(self, node: dict | list) -> dict | list:
+        """
+        Interns the keys and string values of a decoded document.
+        Lists are updated in place. Dictionaries are rebuilt (to replace their keys) right
+        after their contents are interned, so only one copy of a dictionary exists at a time.
+        Returns the interned document.
+        """
+        # No strings are created during the walk, so the ids of dropped strings can't be reused
+        # until it's done
+        self._dropped_.clear()
+        try:
+            if isinstance(node, list):
+                self._intern_list_(node)
+                return node
+
+            return self._intern_dict_(node)
+        finally:
+            self._dropped_.clear()
+
+    def _intern_dict_(self, node: dict) -> dict:
+        for k, v in node.items():
+            if type(v) is str:
+                node[k] = self.value(v)
+            elif type(v) is dict:
+                node[k] = self._intern_dict_(v)
+            elif type(v) is list:
+                self._intern_list_(v)
+
+        return {self.key(k): v for k, v in node.items()}
+
+    def _intern_list_(self, node: list) -> None:
+        i: int
+        for i, v in enumerate(node):
+            if type(v) is str:
+                node[i] = self.value(v)
+            elif type(v) is dict:
+                node[i] = self._intern_dict_(v)
+            elif type(v) is list:
+                self._intern_list_(v)
+
+    def add_stats(self, stats: dict[str, int]) -> None:
+        """Adds the stats of another interner (e.g. from a worker process)"""
+        key: str
+        for key in self.stats:
+            self.stats[key] += stats.get(key, 0)
@@ -0,0 +1,139 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+
+class ManagedObject(Mapping):
+    """
+    A compact, read-only managed object (MO) to use in place of the nested dictionaries
+    {"cls": {"attributes": {...}, "children": [...]}} of the decoded backup.
+    One ManagedObject (3 slots and a children tuple) replaces the two dictionaries and
+    the children list of each MO.
+
+    It stands in for both dictionaries the extractors work with:
+    - The {cls: body} entry of a 'children' list: `cls in mo`, `mo[cls]` (returns the MO itself),
+      and iterating or mo.items() gives the single (cls, mo) pair
+    - The body: mo["attributes"], mo["children"] and mo.get("children", [])
+      ("children" is only present when the MO has children, like the decoded JSON)
+
+    Use to_dict() to get the body back as plain dictionaries (e.g. for JSON output).
+    """
+
+    __slots__ = ("cls", "attributes", "children")
+
+    def __init__(
+        self, cls: str, attributes: dict, children: tuple["ManagedObject", ...] = ()
+    ) -> None:
+        self.cls: str = cls
+        self.attributes: dict = attributes
+        self.children: tuple[ManagedObject, ...] = children
+
+    def __str__(self) -> str:
+        return self.cls
+
+    def __repr__(self) -> str:
+        return f"ManagedObject({self.cls}, {len(self.children)} children)"
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "attributes":
+            return self.attributes
+        elif key == "children" and self.children:
+            return self.children
+        elif key == self.cls:
+            return self
+
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            key == self.cls
+            or key == "attributes"
+            or (key == "children" and bool(self.children))
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        yield self.cls
+
+    def __len__(self) -> int:
+        return 1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ManagedObject):
+            return (
+                self.cls == other.cls
+                and self.attributes == other.attributes
+                and self.children == other.children
+            )
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    @classmethod
+    def from_dict(
+        cls, mo_class: str, body: dict, memo: dict | None = None
+    ) -> "ManagedObject":
+        """
+        Converts a decoded MO body (and its descendants) into ManagedObjects.
+        Bodies shared between several places (see memo) are converted once and stay shared.
+        """
+        memo = {} if memo is None else memo
+        if id(body) in memo:
+            return memo[id(body)]
+
+        mo: ManagedObject = cls(
+            mo_class,
+            body.get("attributes", {}),
+            tuple(
+                cls.from_dict(child_class, child_body, memo)
+                for child in body.get("children", ())
+                for child_class, child_body in child.items()
+            ),
+        )
+        memo[id(body)] = mo
+
+        return mo
+
+    def to_dict(self) -> dict:
+        """Returns the MO body as plain dictionaries, the same structure as the decoded JSON"""
+        body: dict = {"attributes": dict(self.attributes)}
+        if self.children:
+            body["children"] = [{child.cls: child.to_dict()} for child in self.children]
+
+        return body
+
+
+def compact_raw_configs(raw_configs: dict) -> dict:
+    """
+    Converts every managed object under the root keys of the raw configs into ManagedObjects.
+    Root keys harvested from inside other root keys (e.g. infraFuncP inside infraInfra)
+    keep sharing the same objects. Root keys that don't hold a list (e.g. a TenantCollection)
+    are kept as they are.
+    """
+    memo: dict[int, ManagedObject] = {}
+    compacted: dict = {}
+
+    root_key: str
+    for root_key, roots in raw_configs.items():
+        if not isinstance(roots, list):
+            compacted[root_key] = roots
+            continue
+        compacted[root_key] = [
+            ManagedObject.from_dict(root_key, body, memo) for body in roots
+        ]
+
+    return compacted
+
+
+def json_default(obj: Any) -> Any:
+    """
+    A json.dumps() 'default' hook that serializes ManagedObjects (and other Mappings),
+    and Sequences that aren't lists (e.g. a TenantCollection)
+    """
+    if isinstance(obj, ManagedObject):
+        return obj.to_dict()
+    elif isinstance(obj, Mapping):
+        return dict(obj)
+    elif isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+        return list(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,70 @@
+from functools import lru_cache
+
+from .indexes import ChildrenIndex
+
+
+class PathQuery:
+    """
+    A compiled class path through the managed object tree, for example:
+    ("infraInfra", "infraFuncP", "infraAccBndlGrp")
+
+    The first class is a root key of the raw configs (a list of objects), every
+    following class is looked up in the 'children' list of the objects matched so far.
+    Running the query returns the objects matching the final class, in tree order.
+    If any object along the path is missing its 'children' (or the root key is missing)
+    the query returns an empty list.
+    When the dictionary carries a children index (see base.RawConfigs) each step is a
+    lookup in the index instead of a scan of the children lists.
+    """
+
+    __slots__ = ("base_key", "path")
+
+    def __init__(self, base_key: str, path: tuple[str, ...]) -> None:
+        if not path:
+            raise ValueError("A path query needs at least one class below the base key")
+
+        self.base_key: str = base_key
+        self.path: tuple[str, ...] = path
+
+    def __str__(self) -> str:
+        return " > ".join((self.base_key,) + self.path)
+
+    def __repr__(self) -> str:
+        return f"PathQuery({self})"
+
+    def run(self, dictionary: dict) -> list:
+        level: list
+        try:
+            level = dictionary[self.base_key]
+
+            index: ChildrenIndex | None = getattr(dictionary, "children_index", None)
+
+            cls: str
+            for cls in self.path:
+                if index is not None:
+                    level = [
+                        child for each in level for child in index.children(each, cls)
+                    ]
+                else:
+                    level = [
+                        child[cls]
+                        for each in level
+                        for child in each["children"]
+                        if cls in child
+                    ]
+        except KeyError:
+            level = []
+
+        return level
+
+
+@lru_cache(maxsize=None)
+def compile_path(base_key: str, *path: str) -> PathQuery:
+    """
+    Compiles (and caches) a class path into a PathQuery.
+    Repeated calls with the same path return the same PathQuery object.
+
+    Example usage:
+    compile_path("infraInfra", "infraFuncP", "infraAccBndlGrp").run(raw_configs)
+    """
+    return PathQuery(base_key, path)
@@ -0,0 +1,819 @@
+"""
+Synthetic ACI JSON backups, for benchmarks and for testing against large fabrics.
+Write a backup archive from the directory containing the aciextract package with:
+    python -m aciextract.synthetic path_to_backup.tar.gz --size large
+    python -m aciextract.synthetic path_to_backup.tar.gz --leafs 100 --tenants 50 --epgs 20
+"""
+
+import argparse
+import io
+import json
+import random
+import tarfile
+from typing import Callable, Iterator
+
+# Preset fabric sizes (the other parameters keep their defaults, see SyntheticBackup)
+FABRIC_SIZES: dict[str, dict[str, int]] = {
+    "small": {"leafs": 4, "spines": 2, "tenants": 5, "bds": 10, "aps": 2, "epgs": 5},
+    "medium": {
+        "leafs": 40,
+        "spines": 4,
+        "tenants": 25,
+        "bds": 20,
+        "aps": 3,
+        "epgs": 10,
+        "interface_profiles": 20,
+        "selectors": 24,
+        "policy_groups": 40,
+        "vlan_pools": 8,
+    },
+    "large": {
+        "leafs": 200,
+        "spines": 8,
+        "tenants": 100,
+        "bds": 50,
+        "aps": 5,
+        "epgs": 20,
+        "interface_profiles": 100,
+        "selectors": 48,
+        "policy_groups": 200,
+        "vlan_pools": 20,
+        "files": 4,
+    },
+    "xlarge": {
+        "leafs": 400,
+        "spines": 16,
+        "tenants": 300,
+        "bds": 100,
+        "aps": 10,
+        "epgs": 30,
+        "interface_profiles": 200,
+        "selectors": 96,
+        "policy_groups": 400,
+        "vlan_pools": 38,
+        "files": 4,
+    },
+}
+
+
+def _mo_(
+    cls: str,
+    children: list | None = None,
+    attributes: dict[str, str] | None = None,
+    **keywords: str,
+) -> dict:
+    """
+    Returns a managed object the way the backups hold it: {class: {"attributes": {...}, "children": [...]}}
+    Attributes are given as keywords, or in attributes when their name isn't an identifier (e.g. "from")
+    """
+    body: dict = {
+        "attributes": {
+            "annotation": "",
+            "descr": "",
+            "status": "",
+            **(attributes or {}),
+            **keywords,
+        }
+    }
+    if children:
+        body["children"] = children
+    return {cls: body}
+
+
+class SyntheticBackup:
+    """
+    Builds an ACI JSON backup of a fabric of the given size, shaped like the backups
+    ACIUntarJSON reads: the polUni tree (controllers, fabric and access policies, domains
+    and tenants) spread over one or more config files, and a file of dhcpClient objects.
+    Every relation points to an object that exists (switch profile -> interface profile ->
+    selector -> policy group -> AAEP -> domain -> VLAN pool, EPG -> BD -> VRF, ...), so every
+    extractor and index has something to resolve. The same parameters (and seed) always
+    build the same backup.
+
+    Example usage:
+    SyntheticBackup(**FABRIC_SIZES["medium"]).write("medium.tar.gz")
+    SyntheticBackup(leafs=100, tenants=50, epgs=20).write("big.tar.gz")
+    """
+
+    def __init__(
+        self,
+        leafs: int = 4,
+        spines: int = 2,
+        apics: int = 3,
+        tenants: int = 3,
+        vrfs: int = 2,
+        bds: int = 5,
+        aps: int = 2,
+        epgs: int = 5,
+        static_paths: int = 2,
+        contracts: int = 3,
+        filters: int = 3,
+        l3outs: int = 1,
+        interface_profiles: int = 4,
+        selectors: int = 8,
+        policy_groups: int = 8,
+        aaeps: int = 2,
+        vlan_pools: int = 4,
+        vlan_blocks: int = 2,
+        files: int = 1,
+        seed: int = 1,
+    ) -> None:
+        """
+        :param leafs: Leaf switches, each with its own switch profile
+        :param spines: Spine switches (the BGP route reflectors), each with its own switch profile
+        :param apics: APIC controllers
+        :param tenants: Tenants, not counting the mgmt tenant
+        :param vrfs: VRFs per tenant
+        :param bds: Bridge domains per tenant (with a subnet each)
+        :param aps: Application profiles per tenant
+        :param epgs: EPGs per application profile
+        :param static_paths: Static paths per EPG
+        :param contracts: Contracts per tenant (one subject each)
+        :param filters: Filters per tenant (one entry each)
+        :param l3outs: L3Outs per tenant (one external EPG each)
+        :param interface_profiles: Leaf interface profiles, shared round robin by the leaf switch profiles
+        :param selectors: Port selectors per interface profile (one port each)
+        :param policy_groups: Interface policy groups, half access ports and half vPCs
+        :param aaeps: AAEPs, the physical domains are spread over them
+        :param vlan_pools: Static VLAN pools, each with its own physical domain
+        :param vlan_blocks: Encap blocks (of 100 VLANs) per VLAN pool
+        :param files: Number of config files the polUni tree is spread over (up to 4: the
+            controllers, the access policies, the fabric policies and domains, and the tenants),
+            for benchmarking parallel decoding
+        :param seed: Seed of the random attribute values
+        """
+        self.leafs: int = leafs
+        self.spines: int = spines
+        self.apics: int = apics
+        self.tenants: int = tenants
+        self.vrfs: int = max(vrfs, 1)
+        self.bds: int = max(bds, 1)
+        self.aps: int = aps
+        self.epgs: int = epgs
+        self.static_paths: int = static_paths
+        self.contracts: int = contracts
+        self.filters: int = max(filters, 1)
+        self.l3outs: int = l3outs
+        self.interface_profiles: int = max(interface_profiles, 1)
+        self.selectors: int = selectors
+        self.policy_groups: int = max(policy_groups, 1)
+        self.aaeps: int = max(aaeps, 1)
+        self.vlan_pools: int = max(vlan_pools, 1)
+        self.vlan_blocks: int = max(vlan_blocks, 1)
+        self.files: int = max(files, 1)
+        self.seed: int = seed
+
+        self.leaf_ids: list[int] = [101 + leaf for leaf in range(leafs)]
+        # Spines are numbered from the next hundred after the leafs (201 for up to 99 leafs)
+        spine_base: int = ((100 + leafs) // 100 + 1) * 100 + 1
+        self.spine_ids: list[int] = [spine_base + spine for spine in range(spines)]
+
+    def __str__(self) -> str:
+        return "SyntheticBackup"
+
+    def to_dict(self) -> dict:
+        """The parameters of the backup"""
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in ("leaf_ids", "spine_ids")
+        }
+
+    def iter_files(self) -> Iterator[tuple[str, dict]]:
+        """Yields (archive member name, decoded document) for every file of the backup, one at a time"""
+        rnd: random.Random = random.Random(self.seed)
+        # The parts of the polUni tree, a root key is never split between two files as only
+        # the first file a root key is found in is kept (see ExtractInterestingKeys)
+        parts: list[Callable[[], list[dict]]] = [
+            lambda: [
+                self._controllers_(),
+                _mo_("aaaUserEp", [_mo_("aaaFabricSec", fipsMode="disable")]),
+            ],
+            lambda: [self._infra_()],
+            lambda: [self._fabric_(), *self._domains_()],
+            lambda: [
+                self._mgmt_tenant_(),
+                *(self._tenant_(tenant, rnd) for tenant in range(self.tenants)),
+            ],
+        ]
+        files: int = min(self.files, len(parts))
+
+        file_number: int
+        for file_number in range(files):
+            yield f"backup_{file_number + 1}.json", {
+                "polUni": {
+                    "attributes": {"dn": "uni"},
+                    "children": [
+                        mo for part in parts[file_number::files] for mo in part()
+                    ],
+                }
+            }
+
+        yield f"backup_{files + 1}.json", {"imdata": self._dhcp_clients_()}
+
+    def write(self, path: str) -> int:
+        """Writes the backup to a gzipped tarball and returns the number of bytes of JSON written"""
+        total: int = 0
+
+        with tarfile.open(path, "w:gz") as tarball:
+            name: str
+            document: dict
+            for name, document in self.iter_files():
+                data: bytes = json.dumps(document).encode()
+                info: tarfile.TarInfo = tarfile.TarInfo(name)
+                info.size = len(data)
+                tarball.addfile(info, io.BytesIO(data))
+                total += len(data)
+
+        return total
+
+    def _nodes_(self) -> Iterator[tuple[int, str, str]]:
+        """Yields (node id, name, role) for every switch"""
+        node_id: int
+        for node_id in self.leaf_ids:
+            yield node_id, f"leaf{node_id}", "leaf"
+        for node_id in self.spine_ids:
+            yield node_id, f"spine{node_id}", "spine"
+
+    def _controllers_(self) -> dict:
+        cluster: dict = {
+            "cluster": {
+                "fabricName": "synthetic",
+                "fabricId": "1",
+                "clusterSize": str(self.apics),
+                "infraVlan": "3967",
+                "gipoPool": "225.0.0.0/15",
+            },
+            "pods": [{"podId": "1", "tepPool": "10.0.0.0/16"}],
+        }
+        annotations: list[dict] = []
+        apic: int
+        for apic in range(1, self.apics + 1):
+            annotations.append(
+                _mo_(
+                    "tagAnnotation",
+                    key=f"apic{apic}",
+                    value=json.dumps(
+                        {
+                            "serialNumber": f"FCH{apic:08d}",
+                            "nodeId": str(apic),
+                            "nodeName": f"apic{apic}",
+                            "activeNodeAddr": f"10.0.0.{apic}",
+                            "podId": "1",
+                        }
+                    ),
+                )
+            )
+            annotations.append(
+                _mo_(
+                    "tagAnnotation",
+                    key=f"apic{apic}.cimc",
+                    value=json.dumps({"address4": f"10.1.0.{apic}"}),
+                )
+            )
+
+        return _mo_(
+            "ctrlrInst",
+            [
+                _mo_("tagAnnotation", key="bootx.cluster", value=json.dumps(cluster)),
+                _mo_(
+                    "fabricNodeIdentPol",
+                    [
+                        _mo_(
+                            "fabricNodeIdentP",
+                            name=name,
+                            nodeId=str(node_id),
+                            serial=f"FDO{node_id:08d}",
+                            role=role,
+                        )
+                        for node_id, name, role in self._nodes_()
+                    ]
+                    + [
+                        _mo_("fabricCtrlrIdentP", serial=f"FCH{apic:08d}")
+                        for apic in range(1, self.apics + 1)
+                    ],
+                ),
+                _mo_(
+                    "fabricSetupPol",
+                    [
+                        _mo_(
+                            "fabricSetupP",
+                            podId="1",
+                            tepPool="10.0.0.0/16",
+                            podType="physical",
+                        )
+                    ],
+                ),
+                *annotations,
+            ],
+        )
+
+    def _vlan_range_(self, pool: int, block: int) -> tuple[int, int]:
+        """The (from, to) VLANs of an encap block, pools get consecutive ranges of 100 VLANs"""
+        first: int = 100 + ((pool * self.vlan_blocks + block) * 100) % 3900
+        return first, first + 99
+
+    def _infra_(self) -> dict:
+        children: list[dict] = [
+            _mo_(
+                "epLoopProtectP",
+                name="default",
+                adminSt="enabled",
+                loopDetectIntvl="60",
+                loopDetectMult="4",
+                action="port-disable",
+            ),
+            _mo_(
+                "epControlP",
+                name="default",
+                adminSt="enabled",
+                rogueEpDetectIntvl="60",
+                rogueEpDetectMult="4",
+                holdIntvl="1800",
+            ),
+            _mo_("epIpAgingP", name="default", adminSt="enabled"),
+            _mo_(
+                "infraSetPol",
+                unicastXrEpLearnDisable="yes",
+                enforceSubnetCheck="yes",
+                domainValidation="yes",
+                opflexpAuthenticateClients="no",
+                opflexpUseSsl="yes",
+                reallocateGipo="no",
+            ),
+            _mo_("infraPortTrackPol", adminSt="on", delay="120", minlinks="0"),
+            _mo_("infraCPMtuPol", CPMtu="9000"),
+            _mo_("fmcastSystemGIPoPol", useConfiguredSystemGIPo="disabled"),
+            _mo_("cdpIfPol", name="cdp-on", adminSt="enabled"),
+            _mo_("cdpIfPol", name="cdp-off", adminSt="disabled"),
+            _mo_("lldpIfPol", name="lldp-on", adminRxSt="enabled", adminTxSt="enabled"),
+            _mo_("lacpLagPol", name="lacp-active", mode="active"),
+            _mo_("mcpIfPol", name="mcp-on", adminSt="enabled"),
+        ]
+
+        pool: int
+        for pool in range(self.vlan_pools):
+            children.append(
+                _mo_(
+                    "fvnsVlanInstP",
+                    [
+                        _mo_(
+                            "fvnsEncapBlk",
+                            attributes={
+                                "from": f"vlan-{first}",
+                                "to": f"vlan-{last}",
+                                "allocMode": "inherit",
+                                "role": "external",
+                            },
+                        )
+                        for first, last in (
+                            self._vlan_range_(pool, block)
+                            for block in range(self.vlan_blocks)
+                        )
+                    ],
+                    name=f"pool{pool}",
+                    allocMode="static",
+                )
+            )
+
+        aaep: int
+        for aaep in range(self.aaeps):
+            children.append(
+                _mo_(
+                    "infraAttEntityP",
+                    [
+                        _mo_("infraRsDomP", tDn=f"uni/phys-phys{pool}")
+                        for pool in range(aaep, self.vlan_pools, self.aaeps)
+                    ],
+                    name=f"aaep{aaep}",
+                )
+            )
+
+        policy_groups: list[dict] = []
+        group: int
+        for group in range(self.policy_groups):
+            relations: list[dict] = [
+                _mo_(
+                    "infraRsAttEntP", tDn=f"uni/infra/attentp-aaep{group % self.aaeps}"
+                ),
+                _mo_("infraRsCdpIfPol", tnCdpIfPolName="cdp-on"),
+                _mo_("infraRsLldpIfPol", tnLldpIfPolName="lldp-on"),
+                _mo_("infraRsMcpIfPol", tnMcpIfPolName="mcp-on"),
+            ]
+            if group % 2:
+                relations.append(_mo_("infraRsLacpPol", tnLacpLagPolName="lacp-active"))
+                policy_groups.append(
+                    _mo_("infraAccBndlGrp", relations, name=f"vpc{group}", lagT="node")
+                )
+            else:
+                policy_groups.append(
+                    _mo_("infraAccPortGrp", relations, name=f"access{group}")
+                )
+        policy_groups.append(
+            _mo_(
+                "infraSpAccPortGrp",
+                [_mo_("infraRsAttEntP", tDn="uni/infra/attentp-aaep0")],
+                name="spine-access",
+            )
+        )
+        children.append(_mo_("infraFuncP", policy_groups))
+
+        profile: int
+        for profile in range(self.interface_profiles):
+            children.append(
+                _mo_(
+                    "infraAccPortP",
+                    [self._selector_(selector) for selector in range(self.selectors)],
+                    name=f"ifp{profile}",
+                )
+            )
+        children.append(
+            _mo_(
+                "infraSpAccPortP",
+                [
+                    _mo_(
+                        "infraSHPortS",
+                        [
+                            _mo_(
+                                "infraPortBlk",
+                                name="block1",
+                                fromCard="1",
+                                toCard="1",
+                                fromPort="1",
+                                toPort="4",
+                            ),
+                            _mo_(
+                                "infraRsSpAccGrp",
+                                tDn="uni/infra/funcprof/spaccportgrp-spine-access",
+                            ),
+                        ],
+                        name="ipn",
+                        type="range",
+                    )
+                ],
+                name="spine-ifp",
+            )
+        )
+
+        position: int
+        node_id: int
+        for position, node_id in enumerate(self.leaf_ids):
+            children.append(
+                _mo_(
+                    "infraNodeP",
+                    [
+                        _mo_(
+                            "infraLeafS",
+                            [
+                                _mo_(
+                                    "infraNodeBlk",
+                                    name="block1",
+                                    from_=str(node_id),
+                                    to_=str(node_id),
+                                )
+                            ],
+                            name=f"leaf{node_id}",
+                            type="range",
+                        ),
+                        _mo_(
+                            "infraRsAccPortP",
+                            tDn=f"uni/infra/accportprof-ifp{position % self.interface_profiles}",
+                        ),
+                    ],
+                    name=f"leaf{node_id}_swp",
+                )
+            )
+        for node_id in self.spine_ids:
+            children.append(
+                _mo_(
+                    "infraSpineP",
+                    [
+                        _mo_(
+                            "infraSpineS",
+                            [
+                                _mo_(
+                                    "infraNodeBlk",
+                                    name="block1",
+                                    from_=str(node_id),
+                                    to_=str(node_id),
+                                )
+                            ],
+                            name=f"spine{node_id}",
+                            type="range",
+                        ),
+                        _mo_(
+                            "infraRsSpAccPortP", tDn="uni/infra/spaccportprof-spine-ifp"
+                        ),
+                    ],
+                    name=f"spine{node_id}_swp",
+                )
+            )
+
+        return _mo_("infraInfra", children)
+
+    def _selector_(self, selector: int) -> dict:
+        """A port selector of a leaf interface profile, one port on card 1 (or the next cards)"""
+        card: str = str(selector // 48 + 1)
+        port: str = str(selector % 48 + 1)
+        group: int = selector % self.policy_groups
+        target: str = (
+            f"uni/infra/funcprof/accbundle-vpc{group}"
+            if group % 2
+            else f"uni/infra/funcprof/accportgrp-access{group}"
+        )
+
+        return _mo_(
+            "infraHPortS",
+            [
+                _mo_(
+                    "infraPortBlk",
+                    name="block1",
+                    fromCard=card,
+                    toCard=card,
+                    fromPort=port,
+                    toPort=port,
+                ),
+                _mo_("infraRsAccBaseGrp", tDn=target),
+            ],
+            name=f"eth{card}-{port}",
+            type="range",
+        )
+
+    def _fabric_(self) -> dict:
+        vpc_pairs: list[dict] = [
+            _mo_(
+                "fabricExplicitGEp",
+                [
+                    _mo_("fabricNodePEp", id=str(node_id), podId="1")
+                    for node_id in self.leaf_ids[pair : pair + 2]
+                ],
+                name=f"vpc-{self.leaf_ids[pair]}-{self.leaf_ids[pair + 1]}",
+                id=str(pair // 2 + 1),
+            )
+            for pair in range(0, len(self.leaf_ids) - 1, 2)
+        ]
+
+        return _mo_(
+            "fabricInst",
+            [
+                _mo_(
+                    "bgpInstPol",
+                    [
+                        _mo_("bgpAsP", asn="65001"),
+                        _mo_(
+                            "bgpRRP",
+                            [
+                                _mo_("bgpRRNodePEp", podId="1", id=str(node_id))
+                                for node_id in self.spine_ids
+                            ],
+                        ),
+                    ],
+                    name="default",
+                ),
+                _mo_(
+                    "isisDomPol",
+                    [
+                        _mo_(
+                            "isisLvlComp",
+                            lspFastFlood="enabled",
+                            lspGenInitIntvl="50",
+                            lspGenMaxIntvl="8000",
+                            lspGenSecIntvl="50",
+                            spfCompInitIntvl="50",
+                            spfCompMaxIntvl="8000",
+                            spfCompSecIntvl="50",
+                        )
+                    ],
+                    name="default",
+                    mtu="1492",
+                    redistribMetric="63",
+                ),
+                _mo_("mgmtConnectivityPrefs", interfacePref="ooband"),
+                _mo_("coopPol", type="compatible"),
+                _mo_("datetimePol", name="default", adminSt="enabled"),
+                _mo_("fabricProtPol", vpc_pairs, name="default", pairT="explicit"),
+            ],
+        )
+
+    def _domains_(self) -> list[dict]:
+        domains: list[dict] = [
+            _mo_(
+                "physDomP",
+                [_mo_("infraRsVlanNs", tDn=f"uni/infra/vlanns-[pool{pool}]-static")],
+                name=f"phys{pool}",
+            )
+            for pool in range(self.vlan_pools)
+        ]
+        domains.append(
+            _mo_(
+                "l3extDomP",
+                [_mo_("infraRsVlanNs", tDn="uni/infra/vlanns-[pool0]-static")],
+                name="l3dom",
+            )
+        )
+        domains.append(_mo_("vmmProvP", vendor="VMware"))
+
+        return domains
+
+    def _mgmt_tenant_(self) -> dict:
+        return _mo_(
+            "fvTenant",
+            [
+                _mo_(
+                    "mgmtMgmtP",
+                    [
+                        _mo_(
+                            "mgmtOoB",
+                            [
+                                _mo_(
+                                    "mgmtRsOoBStNode",
+                                    tDn=f"topology/pod-1/node-{node_id}",
+                                    addr=f"10.2.{node_id // 256}.{node_id % 256}/16",
+                                    gw="10.2.0.1",
+                                )
+                                for node_id, _, _ in self._nodes_()
+                            ],
+                            name="default",
+                        )
+                    ],
+                    name="default",
+                )
+            ],
+            name="mgmt",
+        )
+
+    def _tenant_(self, tenant: int, rnd: random.Random) -> dict:
+        children: list[dict] = [
+            _mo_("fvCtx", name=f"vrf{vrf}", pcEnfPref="enforced")
+            for vrf in range(self.vrfs)
+        ]
+
+        bd: int
+        for bd in range(self.bds):
+            bd_children: list[dict] = [
+                _mo_("fvRsCtx", tnFvCtxName=f"vrf{bd % self.vrfs}"),
+                _mo_(
+                    "fvSubnet",
+                    ip=f"10.{100 + tenant // 256}.{tenant % 256}.{bd % 64 * 4 + 1}/30",
+                    scope=rnd.choice(["private", "public", "public,shared"]),
+                ),
+            ]
+            if self.l3outs:
+                bd_children.append(_mo_("fvRsBDToOut", tnL3extOutName="out0"))
+            children.append(
+                _mo_(
+                    "fvBD",
+                    bd_children,
+                    name=f"bd{bd}",
+                    unicastRoute="yes",
+                    arpFlood=rnd.choice(["yes", "no"]),
+                )
+            )
+
+        flt: int
+        for flt in range(self.filters):
+            children.append(
+                _mo_(
+                    "vzFilter",
+                    [
+                        _mo_(
+                            "vzEntry",
+                            name="entry1",
+                            etherT="ip",
+                            prot="tcp",
+                            dFromPort=str(8000 + flt),
+                            dToPort=str(8000 + flt),
+                        )
+                    ],
+                    name=f"flt{flt}",
+                )
+            )
+
+        contract: int
+        for contract in range(self.contracts):
+            children.append(
+                _mo_(
+                    "vzBrCP",
+                    [
+                        _mo_(
+                            "vzSubj",
+                            [
+                                _mo_(
+                                    "vzRsSubjFiltAtt",
+                                    tnVzFilterName=f"flt{contract % self.filters}",
+                                )
+                            ],
+                            name="subject1",
+                        )
+                    ],
+                    name=f"con{contract}",
+                    scope="context",
+                )
+            )
+
+        ap: int
+        for ap in range(self.aps):
+            children.append(
+                _mo_(
+                    "fvAp",
+                    [self._epg_(ap * self.epgs + epg, rnd) for epg in range(self.epgs)],
+                    name=f"ap{ap}",
+                )
+            )
+
+        l3out: int
+        for l3out in range(self.l3outs):
+            external_epg_children: list[dict] = [
+                _mo_("l3extSubnet", ip="0.0.0.0/0", scope="import-security")
+            ]
+            if self.contracts:
+                external_epg_children.append(_mo_("fvRsCons", tnVzBrCPName="con0"))
+            children.append(
+                _mo_(
+                    "l3extOut",
+                    [
+                        _mo_("l3extRsEctx", tnFvCtxName=f"vrf{l3out % self.vrfs}"),
+                        _mo_("l3extRsL3DomAtt", tDn="uni/l3dom-l3dom"),
+                        _mo_("l3extInstP", external_epg_children, name="external"),
+                    ],
+                    name=f"out{l3out}",
+                )
+            )
+
+        return _mo_("fvTenant", children, name=f"tenant{tenant}")
+
+    def _epg_(self, epg: int, rnd: random.Random) -> dict:
+        """An EPG, numbered within its tenant"""
+        pool: int = epg % self.vlan_pools
+        first: int
+        last: int
+        first, last = self._vlan_range_(pool, 0)
+
+        children: list[dict] = [
+            _mo_("fvRsBd", tnFvBDName=f"bd{epg % self.bds}"),
+            _mo_("fvRsDomAtt", tDn=f"uni/phys-phys{pool}"),
+        ]
+        if self.contracts:
+            children.append(_mo_("fvRsProv", tnVzBrCPName=f"con{epg % self.contracts}"))
+            children.append(
+                _mo_("fvRsCons", tnVzBrCPName=f"con{(epg + 1) % self.contracts}")
+            )
+
+        path: int
+        for path in range(self.static_paths if self.leaf_ids else 0):
+            node_id: int = self.leaf_ids[(epg + path) % len(self.leaf_ids)]
+            port: int = (epg + path) % 48 + 1
+            children.append(
+                _mo_(
+                    "fvRsPathAtt",
+                    tDn=f"topology/pod-1/paths-{node_id}/pathep-[eth1/{port}]",
+                    encap=f"vlan-{first + epg % (last - first + 1)}",
+                    mode="regular",
+                )
+            )
+
+        return _mo_(
+            "fvAEPg",
+            children,
+            name=f"epg{epg}",
+            prefGrMemb=rnd.choice(["include", "exclude"]),
+            floodOnEncap="disabled",
+        )
+
+    def _dhcp_clients_(self) -> list[dict]:
+        return [
+            _mo_(
+                "dhcpClient",
+                name=name,
+                nodeRole=role,
+                model="N9K-C93180YC-FX" if role == "leaf" else "N9K-C9364C",
+                runningVer="n9000-16.0(3e)",
+            )
+            for _, name, role in self._nodes_()
+        ]
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Write a synthetic ACI JSON backup archive"
+    )
+    parser.add_argument("path", help="Path of the backup archive to write (.tar.gz)")
+    parser.add_argument(
+        "--size", choices=list(FABRIC_SIZES), help="Start from a preset fabric size"
+    )
+    parameter: str
+    for parameter in SyntheticBackup().to_dict():
+        parser.add_argument(f"--{parameter.replace('_', '-')}", type=int)
+    arguments: argparse.Namespace = parser.parse_args()
+
+    parameters: dict[str, int] = dict(FABRIC_SIZES.get(arguments.size, {}))
+    parameters.update(
+        {
+            key: value
+            for key, value in vars(arguments).items()
+            if key not in ("path", "size") and value is not None
+        }
+    )
+    backup: SyntheticBackup = SyntheticBackup(**parameters)
+    written: int = backup.write(arguments.path)
+    print(f"Wrote {arguments.path} ({written / 1024**2:.1f} MB of JSON)")
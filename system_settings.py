@@ -2,15 +2,16 @@ from .base import ChildExtractorBase
 
 
 class BGPConfig(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
         # Extract the BGP Policy Name
         bgp_policy_name: str
         try:
             bgp_policy_name = [
-                child["bgpInstPol"]["attributes"]["name"]
+                child["attributes"]["name"]
                 for each in self.raw_configs["fabricInst"]
-                for child in each["children"]
-                if "bgpInstPol" in child
+                for child in self._children_(each, "bgpInstPol")
             ][0]
         except KeyError:
             bgp_policy_name = ""
@@ -21,12 +22,10 @@ class BGPConfig(ChildExtractorBase):
         bgp_asn: str
         try:
             bgp_asn = [
-                rr["bgpAsP"]["attributes"]["asn"]
+                rr["attributes"]["asn"]
                 for each in self.raw_configs["fabricInst"]
-                for child in each["children"]
-                if "bgpInstPol" in child
-                for rr in child["bgpInstPol"]["children"]
-                if "bgpAsP" in rr
+                for child in self._children_(each, "bgpInstPol")
+                for rr in self._children_(child, "bgpAsP")
             ][0]
         except IndexError:
             bgp_asn = "No BGP ASN Configured"
@@ -36,14 +35,11 @@ class BGPConfig(ChildExtractorBase):
         try:
             bgp_rrs = sorted(
                 [
-                    f"pod-{node['bgpRRNodePEp']['attributes']['podId']}/spine-{node['bgpRRNodePEp']['attributes']['id']}"
+                    f"pod-{node['attributes']['podId']}/spine-{node['attributes']['id']}"
                     for each in self.raw_configs["fabricInst"]
-                    for child in each["children"]
-                    if "bgpInstPol" in child
-                    for rr in child["bgpInstPol"]["children"]
-                    if "bgpRRP" in rr
-                    for node in rr["bgpRRP"]["children"]
-                    if "bgpRRNodePEp" in node
+                    for child in self._children_(each, "bgpInstPol")
+                    for rr in self._children_(child, "bgpRRP")
+                    for node in self._children_(rr, "bgpRRNodePEp")
                 ]
             )
         except KeyError as e:
@@ -60,13 +56,13 @@ class BGPConfig(ChildExtractorBase):
 
 
 class EndpointControls(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
         # EP LOOP PROTECTION
-        ep_loop_protection: dict = [
-            child["epLoopProtectP"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "epLoopProtectP" in child
-        ][0]
+        ep_loop_protection: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "epLoopProtectP"
+        )[0]["attributes"]
         self.config["ep_loop_protection"] = {
             "adminSt": ep_loop_protection["adminSt"],
             "loopDetectIntvl": ep_loop_protection["loopDetectIntvl"],
@@ -75,11 +71,9 @@ class EndpointControls(ChildExtractorBase):
         }
 
         # ROGUE EP CONTROL
-        rogue_ep_control: dict = [
-            child["epControlP"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "epControlP" in child
-        ][0]
+        rogue_ep_control: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "epControlP"
+        )[0]["attributes"]
         self.config["rogue_ep_control"] = {
             "adminSt": rogue_ep_control["adminSt"],
             "rogueEpDetectIntvl": rogue_ep_control["rogueEpDetectIntvl"],
@@ -88,23 +82,21 @@ class EndpointControls(ChildExtractorBase):
         }
 
         # IP AGING
-        ip_aging: dict = [
-            child["epIpAgingP"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "epIpAgingP" in child
-        ][0]
+        ip_aging: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "epIpAgingP"
+        )[0]["attributes"]
         self.config["ip_aging"] = {
             "adminSt": ip_aging["adminSt"],
         }
 
 
 class FabricWideSettings(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
-        fabric_wide_settings: dict = [
-            child["infraSetPol"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "infraSetPol" in child
-        ][0]
+        fabric_wide_settings: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "infraSetPol"
+        )[0]["attributes"]
 
         # ATTEMPT TO SET ATTRIBUTES THAT MAY NOT EXIST ON OLDER VESIONS OF ACI
         enforce_subnet_check: str
@@ -164,12 +156,12 @@ class FabricWideSettings(ChildExtractorBase):
 
 
 class ISISPolicy(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst",)
+
     def _extract_config_(self) -> None:
-        isis_config: dict = [
-            child["isisDomPol"]
-            for child in self.raw_configs["fabricInst"][0]["children"]
-            if "isisDomPol" in child
-        ][0]
+        isis_config: dict = self._children_(
+            self.raw_configs["fabricInst"][0], "isisDomPol"
+        )[0]
 
         self.config = {
             "mtu": isis_config["attributes"]["mtu"],
@@ -199,12 +191,12 @@ class ISISPolicy(ChildExtractorBase):
 
 
 class PortTracking(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("infraInfra",)
+
     def _extract_config_(self) -> None:
-        port_tracking: dict = [
-            child["infraPortTrackPol"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "infraPortTrackPol" in child
-        ][0]
+        port_tracking: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "infraPortTrackPol"
+        )[0]["attributes"]
 
         # ATTEMPT TO SET ATTRIBUTES THAT MAY NOT EXIST ON OLDER VESIONS OF ACI
         includeApicPorts: str
@@ -222,48 +214,40 @@ class PortTracking(ChildExtractorBase):
 
 
 class MiscConfig(ChildExtractorBase):
+    depends_on: tuple[str, ...] = ("fabricInst", "infraInfra", "aaaUserEp")
+
     def _extract_config_(self) -> None:
         # APIC CONNECTIVITY PREFERENCES
-        mgmt_prefs: dict = [
-            child["mgmtConnectivityPrefs"]["attributes"]
-            for child in self.raw_configs["fabricInst"][0]["children"]
-            if "mgmtConnectivityPrefs" in child
-        ][0]
+        mgmt_prefs: dict = self._children_(
+            self.raw_configs["fabricInst"][0], "mgmtConnectivityPrefs"
+        )[0]["attributes"]
         self.config["apic_conn_pref"] = mgmt_prefs["interfacePref"]
 
         # CONTROL PLANE MTU
-        cp_mtu: dict = [
-            child["infraCPMtuPol"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "infraCPMtuPol" in child
-        ][0]
+        cp_mtu: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "infraCPMtuPol"
+        )[0]["attributes"]
         self.config["control_plane_mtu"] = cp_mtu["CPMtu"]
 
         # COOP GROUP TYPE
-        coop_grp: dict = [
-            child["coopPol"]["attributes"]
-            for child in self.raw_configs["fabricInst"][0]["children"]
-            if "coopPol" in child
-        ][0]
+        coop_grp: dict = self._children_(self.raw_configs["fabricInst"][0], "coopPol")[
+            0
+        ]["attributes"]
         self.config["coop_group_type"] = coop_grp["type"]
 
         # FABRIC SECURITY - FIPS MODE
-        fips_mode: dict = [
-            child["aaaFabricSec"]["attributes"]
-            for child in self.raw_configs["aaaUserEp"][0]["children"]
-            if "aaaFabricSec" in child
-        ][0]
+        fips_mode: dict = self._children_(
+            self.raw_configs["aaaUserEp"][0], "aaaFabricSec"
+        )[0]["attributes"]
         self.config["fips_mode"] = fips_mode["fipsMode"]
 
         # GLOBAL AES ENCRYPTION
         # This does not show up in the config files and will have to be gathered manually
 
         # SYSTEM GLOBAL GIPO POLICY
-        glob_gipo_pol: dict = [
-            child["fmcastSystemGIPoPol"]["attributes"]
-            for child in self.raw_configs["infraInfra"][0]["children"]
-            if "fmcastSystemGIPoPol" in child
-        ][0]
+        glob_gipo_pol: dict = self._children_(
+            self.raw_configs["infraInfra"][0], "fmcastSystemGIPoPol"
+        )[0]["attributes"]
         self.config["useConfiguredSystemGIPo"] = glob_gipo_pol[
             "useConfiguredSystemGIPo"
         ]
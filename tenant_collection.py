@@ -0,0 +1,139 @@
+import pickle
+from collections.abc import Sequence
+from typing import Any, Iterator
+
+from .managed_object import ManagedObject
+
+
+class TenantCollection(Sequence):
+    """
+    A read-only list of tenants (fvTenant MOs) that only builds a tenant when it is accessed.
+    Each tenant subtree is kept serialized (pickled bytes, several times smaller than the
+    nested dictionaries) along with its name and MO count. Accessing a tenant by name or by
+    position decodes it, and keeps the decoded copy until release() is called. Iterating
+    decodes the tenants one at a time without keeping them (see stream()), so walking every
+    tenant doesn't pin them all in memory.
+
+    Iterating, indexing and len() behave like the plain list of tenants, and the names and
+    sizes of the tenants can be listed without decoding any of them:
+    config.tenants.names(), config.tenants.counts(), config.tenants["common"]
+    """
+
+    def __init__(self, tenants: list[dict], compact: bool = False) -> None:
+        """
+        :param tenants: The fvTenant MO bodies to serialize
+        :param compact: Build accessed tenants as ManagedObjects instead of dictionaries
+        """
+        self.compact: bool = compact
+        self._names_: list[str] = []
+        self._counts_: list[int] = []
+        self._blobs_: list[bytes] = []
+        self._materialized_: dict[int, Any] = {}
+
+        tenant: dict
+        for tenant in tenants:
+            self._names_.append(tenant.get("attributes", {}).get("name", ""))
+            self._counts_.append(self._count_mos_(tenant))
+            self._blobs_.append(pickle.dumps(tenant, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self._positions_: dict[str, int] = {
+            name: position for position, name in enumerate(self._names_)
+        }
+
+    def __str__(self) -> str:
+        return f"TenantCollection({len(self)} tenants)"
+
+    def __len__(self) -> int:
+        return len(self._blobs_)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, str):
+            return item in self._positions_
+
+        return super().__contains__(item)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TenantCollection):
+            # Compares the serialized tenants, without decoding them
+            return self._names_ == other._names_ and self._blobs_ == other._blobs_
+        elif isinstance(other, list):
+            return list(self) == other
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __iter__(self) -> Iterator:
+        tenant: Any
+        for _, tenant in self.stream():
+            yield tenant
+
+    def __getitem__(self, key: int | slice | str) -> Any:
+        if isinstance(key, str):
+            return self._materialize_(self._positions_[key])
+        elif isinstance(key, slice):
+            return [self._materialize_(position) for position in range(len(self))[key]]
+
+        return self._materialize_(range(len(self))[key])
+
+    def _count_mos_(self, tenant: dict) -> int:
+        count: int = 0
+        stack: list[dict] = [tenant]
+        while stack:
+            mo: dict = stack.pop()
+            count += 1
+            stack.extend(
+                child_mo
+                for child in mo.get("children", [])
+                for child_mo in child.values()
+            )
+
+        return count
+
+    def _materialize_(self, position: int) -> Any:
+        if position not in self._materialized_:
+            tenant: dict = pickle.loads(self._blobs_[position])
+            self._materialized_[position] = (
+                ManagedObject.from_dict("fvTenant", tenant) if self.compact else tenant
+            )
+
+        return self._materialized_[position]
+
+    def stream(self) -> Iterator[tuple[str, Any]]:
+        """
+        Yields (name, tenant) for every tenant, decoding them one at a time without keeping
+        the decoded copies (tenants that were already accessed are reused)
+        """
+        position: int
+        for position, name in enumerate(self._names_):
+            if position in self._materialized_:
+                yield name, self._materialized_[position]
+            else:
+                tenant: dict = pickle.loads(self._blobs_[position])
+                yield name, (
+                    ManagedObject.from_dict("fvTenant", tenant)
+                    if self.compact
+                    else tenant
+                )
+
+    def names(self) -> list[str]:
+        """Returns the tenant names without decoding any tenants"""
+        return list(self._names_)
+
+    def counts(self) -> dict[str, int]:
+        """Returns {tenant name: number of MOs in the tenant} without decoding any tenants"""
+        return dict(zip(self._names_, self._counts_))
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Returns the tenant with the given name (decoding it if needed), or default"""
+        if name not in self._positions_:
+            return default
+
+        return self[name]
+
+    def release(self, name: str | None = None) -> None:
+        """Drops the decoded copy of a tenant (or of every tenant), keeping only its serialized form"""
+        if name is None:
+            self._materialized_.clear()
+        else:
+            self._materialized_.pop(self._positions_[name], None)
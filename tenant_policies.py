@@ -0,0 +1,205 @@
+from typing import Iterator
+
+from .base import ChildExtractorBase
+from .indexes import make_rn
+
+
+class TenantChildExtractorBase(ChildExtractorBase):
+    """
+    Child Extractor for the objects configured inside tenants.
+    The config of every tenant extractor is keyed by tenant name, then by object name:
+    {tenant name: {object name: {"dn": "...", "attributes": {...}, ...}}}
+    Relations to other objects are recorded by name here and resolved to DNs by
+    ExtractTenantPolicies once every tenant extractor has run.
+    """
+
+    depends_on: tuple[str, ...] = ("fvTenant",)
+
+    def _tenants_(self) -> Iterator[tuple[str, str, dict]]:
+        """Yields (tenant name, tenant dn, tenant managed object) for every tenant"""
+        tenant: dict
+        for tenant in self.raw_configs.get("fvTenant", []):
+            attributes: dict = tenant.get("attributes", {})
+            yield attributes.get("name", ""), _dn_(
+                "uni", "fvTenant", attributes
+            ), tenant
+
+    def _children_of_(self, mo: dict, cls: str) -> list:
+        """Like _children_(), but returns an empty list when the object has no children"""
+        if "children" not in mo:
+            return []
+
+        return self._children_(mo, cls)
+
+    def _relation_(self, mo: dict, cls: str, name_attribute: str) -> str | None:
+        """Returns the target name of the object's (first) relation of the given class, or None"""
+        relations: list = self._children_of_(mo, cls)
+        if not relations:
+            return None
+
+        return relations[0].get("attributes", {}).get(name_attribute, "")
+
+    def _relations_(self, mo: dict, cls: str, attribute: str) -> list[str]:
+        """Returns the given attribute of every relation of the given class"""
+        return [
+            relation.get("attributes", {}).get(attribute, "")
+            for relation in self._children_of_(mo, cls)
+        ]
+
+
+def _dn_(parent_dn: str, cls: str, attributes: dict) -> str:
+    """Returns the object's 'dn' attribute, or builds the DN from its parent DN and RN"""
+    return attributes.get("dn") or f"{parent_dn}/{make_rn(cls, attributes)}"
+
+
+class TenantVRFs(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {
+                vrf["attributes"]["name"]: {
+                    "dn": _dn_(tenant_dn, "fvCtx", vrf["attributes"]),
+                    "attributes": vrf["attributes"],
+                }
+                for vrf in self._children_of_(tenant, "fvCtx")
+            }
+
+
+class TenantBridgeDomains(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {
+                bd["attributes"]["name"]: {
+                    "dn": _dn_(tenant_dn, "fvBD", bd["attributes"]),
+                    "attributes": bd["attributes"],
+                    "vrf_name": self._relation_(bd, "fvRsCtx", "tnFvCtxName"),
+                    "subnets": [
+                        subnet["attributes"]
+                        for subnet in self._children_of_(bd, "fvSubnet")
+                    ],
+                    "l3out_names": self._relations_(
+                        bd, "fvRsBDToOut", "tnL3extOutName"
+                    ),
+                }
+                for bd in self._children_of_(tenant, "fvBD")
+            }
+
+
+class TenantApplicationProfiles(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {}
+
+            ap: dict
+            for ap in self._children_of_(tenant, "fvAp"):
+                ap_dn: str = _dn_(tenant_dn, "fvAp", ap["attributes"])
+                self.config[tenant_name][ap["attributes"]["name"]] = {
+                    "dn": ap_dn,
+                    "attributes": ap["attributes"],
+                    "epgs": {
+                        epg["attributes"]["name"]: self._epg_(ap_dn, epg)
+                        for epg in self._children_of_(ap, "fvAEPg")
+                    },
+                }
+
+    def _epg_(self, ap_dn: str, epg: dict) -> dict:
+        return {
+            "dn": _dn_(ap_dn, "fvAEPg", epg["attributes"]),
+            "attributes": epg["attributes"],
+            "bd_name": self._relation_(epg, "fvRsBd", "tnFvBDName"),
+            "provided_names": self._relations_(epg, "fvRsProv", "tnVzBrCPName"),
+            "consumed_names": self._relations_(epg, "fvRsCons", "tnVzBrCPName"),
+            "domains": self._relations_(epg, "fvRsDomAtt", "tDn"),
+            "static_paths": [
+                path["attributes"] for path in self._children_of_(epg, "fvRsPathAtt")
+            ],
+        }
+
+
+class TenantContracts(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {
+                contract["attributes"]["name"]: {
+                    "dn": _dn_(tenant_dn, "vzBrCP", contract["attributes"]),
+                    "attributes": contract["attributes"],
+                    "subjects": {
+                        subject["attributes"]["name"]: {
+                            "attributes": subject["attributes"],
+                            "filter_names": self._relations_(
+                                subject, "vzRsSubjFiltAtt", "tnVzFilterName"
+                            ),
+                        }
+                        for subject in self._children_of_(contract, "vzSubj")
+                    },
+                }
+                for contract in self._children_of_(tenant, "vzBrCP")
+            }
+
+
+class TenantFilters(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {
+                flt["attributes"]["name"]: {
+                    "dn": _dn_(tenant_dn, "vzFilter", flt["attributes"]),
+                    "attributes": flt["attributes"],
+                    "entries": [
+                        entry["attributes"]
+                        for entry in self._children_of_(flt, "vzEntry")
+                    ],
+                }
+                for flt in self._children_of_(tenant, "vzFilter")
+            }
+
+
+class TenantL3Outs(TenantChildExtractorBase):
+    def _extract_config_(self) -> None:
+        tenant_name: str
+        tenant_dn: str
+        tenant: dict
+        for tenant_name, tenant_dn, tenant in self._tenants_():
+            self.config[tenant_name] = {}
+
+            l3out: dict
+            for l3out in self._children_of_(tenant, "l3extOut"):
+                l3out_dn: str = _dn_(tenant_dn, "l3extOut", l3out["attributes"])
+                self.config[tenant_name][l3out["attributes"]["name"]] = {
+                    "dn": l3out_dn,
+                    "attributes": l3out["attributes"],
+                    "vrf_name": self._relation_(l3out, "l3extRsEctx", "tnFvCtxName"),
+                    "domain": next(
+                        iter(self._relations_(l3out, "l3extRsL3DomAtt", "tDn")), None
+                    ),
+                    "external_epgs": {
+                        instp["attributes"]["name"]: {
+                            "dn": _dn_(l3out_dn, "l3extInstP", instp["attributes"]),
+                            "attributes": instp["attributes"],
+                            "subnets": [
+                                subnet["attributes"]
+                                for subnet in self._children_of_(instp, "l3extSubnet")
+                            ],
+                            "provided_names": self._relations_(
+                                instp, "fvRsProv", "tnVzBrCPName"
+                            ),
+                            "consumed_names": self._relations_(
+                                instp, "fvRsCons", "tnVzBrCPName"
+                            ),
+                        }
+                        for instp in self._children_of_(l3out, "l3extInstP")
+                    },
+                }